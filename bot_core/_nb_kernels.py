@@ -0,0 +1,692 @@
+# Code/bot_core/_nb_kernels.py
+#
+# Numba-compiled loops used by the backtest engine. Every kernel works on plain
+# NumPy arrays and integer codes so it can be compiled with @njit; when numba is
+# not installed the same functions simply run as regular Python, except for the
+# batched exit walk and the drawdown, which switch to vectorised NumPy versions.
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+    prange = range
+
+# Trailing stop methods
+METHOD_HA = 0
+METHOD_EMA = 1
+METHOD_PCT = 2
+METHOD_ATR = 3
+METHOD_FIXED = 4
+N_METHODS = 5
+
+# Display names, indexed by METHOD_* code
+METHOD_NAMES = (
+    "Heiken Ashi Candle Trail (1-3 candle lookback)",
+    "EMA Trail (e.g., EMA(9) trailing stop)",
+    "% Price Trail (e.g., 1.5% below current price)",
+    "ATR-Based Trail (1.5x ATR)",
+    "Fixed Tick/Point Trail (custom value)",
+)
+
+# Exit reasons, indexed by the code returned from the simulators
+EXIT_MAX_BARS = 0
+EXIT_STOP = 1
+EXIT_HA_PROFIT = 2
+EXIT_HA_CUT_LOSS = 3
+EXIT_STOCH_DOWN = 4
+EXIT_STOCH_UP = 5
+EXIT_BELOW_VWAP_EMA = 6
+EXIT_ABOVE_VWAP_EMA = 7
+
+EXIT_REASONS = (
+    "Max bars reached",
+    "Stop loss hit",
+    "Heiken Ashi reversal with profit",
+    "Heiken Ashi reversal - cut loss",
+    "Stochastic overbought and crossing down",
+    "Stochastic oversold and crossing up",
+    "Price crossed below VWAP and EMA",
+    "Price crossed above VWAP and EMA",
+)
+
+# Option model shared by every method
+_DELTA = 0.60
+_GAMMA = 0.02
+
+
+@njit(cache=True)
+def simulate_all_methods(close, atr, ha_open, ha_close, stoch_k, stoch_d, vwap, ema15,
+                         start_idx, direction, entry_option_price,
+                         atr_multiple, trail_percentage, fixed_stop, min_holding_bars,
+                         ha_exit_min_profit, stoch_exit_overbought, stoch_exit_oversold):
+    """
+    Walk forward from an entry once and find the exit for every trailing stop method
+
+    All methods share the same option price path, so only their stops differ;
+    the walk stops as soon as every method has exited.
+
+    Args:
+        close, atr, ha_open, ha_close, stoch_k, stoch_d, vwap, ema15 (ndarray): Per-candle series
+        start_idx (int): Entry candle index
+        direction (int): 1 for bullish (call), -1 for bearish (put)
+        entry_option_price (float): Option premium paid at entry
+
+    Returns:
+        tuple: (exit_index, exit_option_price, exit_reason_code) arrays indexed by METHOD_* code
+    """
+    n = close.shape[0]
+    max_bars = min(30, n - start_idx)  # Maximum 30 bars or until end of data
+    entry_stock_price = close[start_idx]
+
+    exit_idx = np.full(N_METHODS, -1, dtype=np.int64)
+    exit_price = np.zeros(N_METHODS, dtype=np.float64)
+    exit_reason = np.zeros(N_METHODS, dtype=np.int64)
+
+    # Initial stop on the option price for each method
+    stop = np.empty(N_METHODS, dtype=np.float64)
+    stop[METHOD_HA] = entry_option_price * 0.7  # 30% stop loss
+    stop[METHOD_EMA] = entry_option_price * 0.7
+    stop[METHOD_ATR] = entry_option_price - (atr[start_idx] * _DELTA * atr_multiple)
+    if entry_option_price * 0.5 > stop[METHOD_ATR]:
+        stop[METHOD_ATR] = entry_option_price * 0.5  # At least 50% stop
+    stop[METHOD_PCT] = entry_option_price * (1 - trail_percentage / 100)
+    stop[METHOD_FIXED] = entry_option_price - fixed_stop
+    if 0.05 > stop[METHOD_FIXED]:
+        stop[METHOD_FIXED] = 0.05  # Minimum 5 cents
+
+    # Track maximum option price for trailing stops
+    max_option_price = entry_option_price
+    remaining = N_METHODS
+
+    for i in range(start_idx + 1, min(start_idx + max_bars, n)):
+        bars_held = i - start_idx
+
+        # Skip exit checks if minimum holding period not met
+        if bars_held < min_holding_bars:
+            continue
+
+        # Option price from delta, gamma and time decay (78 bars per day for 5m)
+        current_stock_price = close[i]
+        stock_change = current_stock_price - entry_stock_price
+        current_option_price = (entry_option_price + direction * (stock_change * _DELTA)
+                                + 0.5 * _GAMMA * (stock_change ** 2))
+        current_option_price -= entry_option_price * 0.02 * (bars_held / 78)
+        if 0.01 > current_option_price:
+            current_option_price = 0.01
+
+        # Check each open method for a stop hit
+        for m in range(N_METHODS):
+            if exit_idx[m] < 0 and current_option_price <= stop[m]:
+                exit_idx[m] = i
+                exit_price[m] = stop[m]
+                exit_reason[m] = EXIT_STOP
+                remaining -= 1
+        if remaining == 0:
+            return exit_idx, exit_price, exit_reason
+
+        # Update maximum price and trail every stop
+        if current_option_price > max_option_price:
+            max_option_price = current_option_price
+
+            if i > start_idx + 1 and max_option_price * 0.75 > stop[METHOD_HA]:
+                stop[METHOD_HA] = max_option_price * 0.75
+            if max_option_price * 0.8 > stop[METHOD_EMA]:
+                stop[METHOD_EMA] = max_option_price * 0.8
+            new_stop = max_option_price - (atr[i] * _DELTA * 1.5)
+            if new_stop > stop[METHOD_ATR]:
+                stop[METHOD_ATR] = new_stop
+            new_stop = max_option_price * (1 - 0.25)
+            if new_stop > stop[METHOD_PCT]:
+                stop[METHOD_PCT] = new_stop
+            new_stop = max_option_price - 0.50
+            if new_stop > stop[METHOD_FIXED]:
+                stop[METHOD_FIXED] = new_stop
+
+        current_option_pnl_pct = ((current_option_price - entry_option_price) / entry_option_price) * 100
+        reason = -1
+
+        # Heiken Ashi reversal against the trade
+        if (direction == 1 and ha_open[i] > ha_close[i]) or (direction == -1 and ha_open[i] < ha_close[i]):
+            if current_option_pnl_pct >= ha_exit_min_profit:
+                reason = EXIT_HA_PROFIT
+            elif current_option_pnl_pct < -10:
+                reason = EXIT_HA_CUT_LOSS
+
+        # Opposing Stochastic crossover, only when profitable
+        if reason < 0:
+            k = stoch_k[i]
+            d = stoch_d[i]
+            if i > start_idx + 1:
+                prev_k = stoch_k[i - 1]
+                prev_d = stoch_d[i - 1]
+            else:
+                prev_k = k
+                prev_d = d
+            if direction == 1 and k > stoch_exit_overbought and prev_k > prev_d and k < d:
+                if current_option_pnl_pct > 0:
+                    reason = EXIT_STOCH_DOWN
+            elif direction == -1 and k < stoch_exit_oversold and prev_k < prev_d and k > d:
+                if current_option_pnl_pct > 0:
+                    reason = EXIT_STOCH_UP
+
+        # VWAP / EMA crossover against the trade
+        if reason < 0:
+            v = vwap[i]
+            e = ema15[i]
+            if not (np.isnan(v) or np.isnan(e)):
+                if direction == 1 and current_stock_price < min(v, e):
+                    if current_option_pnl_pct > -5:
+                        reason = EXIT_BELOW_VWAP_EMA
+                elif direction == -1 and current_stock_price > max(v, e):
+                    if current_option_pnl_pct > -5:
+                        reason = EXIT_ABOVE_VWAP_EMA
+
+        # Signal exits apply to every method still open
+        if reason >= 0:
+            for m in range(N_METHODS):
+                if exit_idx[m] < 0:
+                    exit_idx[m] = i
+                    exit_price[m] = current_option_price
+                    exit_reason[m] = reason
+            return exit_idx, exit_price, exit_reason
+
+    # Max bars or end of data: exit at the last simulated close
+    if start_idx + max_bars < n:
+        last_idx = start_idx + max_bars - 1
+        bars = max_bars
+    else:
+        last_idx = n - 1
+        bars = n - start_idx - 1
+    final_stock_change = close[last_idx] - entry_stock_price
+    final_option_price = (entry_option_price + direction * (final_stock_change * _DELTA)
+                          + 0.5 * _GAMMA * (final_stock_change ** 2))
+    final_option_price -= entry_option_price * 0.02 * (bars / 78)
+    if 0.01 > final_option_price:
+        final_option_price = 0.01
+    for m in range(N_METHODS):
+        if exit_idx[m] < 0:
+            exit_idx[m] = last_idx
+            exit_price[m] = final_option_price
+            exit_reason[m] = EXIT_MAX_BARS
+    return exit_idx, exit_price, exit_reason
+
+
+@njit(parallel=True, cache=True)
+def simulate_all_signals(close, atr, ha_open, ha_close, stoch_k, stoch_d, vwap, ema15,
+                         signal_idx, directions, entry_option_prices,
+                         atr_multiple, trail_percentage, fixed_stop, min_holding_bars,
+                         ha_exit_min_profit, stoch_exit_overbought, stoch_exit_oversold):
+    """
+    Run simulate_all_methods for every signal, spreading the signals over all cores
+
+    Each entry walks its own future window, so the signals are independent of each other.
+
+    Args:
+        close, atr, ha_open, ha_close, stoch_k, stoch_d, vwap, ema15 (ndarray): Per-candle series
+        signal_idx (ndarray): Entry candle index of each signal
+        directions (ndarray): 1 for bullish (call), -1 for bearish (put), per signal
+        entry_option_prices (ndarray): Option premium paid at each entry
+
+    Returns:
+        tuple: (exit_index, exit_option_price, exit_reason_code) arrays of shape (signals, N_METHODS)
+    """
+    n_sig = signal_idx.shape[0]
+    exit_idx = np.empty((n_sig, N_METHODS), dtype=np.int64)
+    exit_price = np.empty((n_sig, N_METHODS), dtype=np.float64)
+    exit_reason = np.empty((n_sig, N_METHODS), dtype=np.int64)
+
+    for k in prange(n_sig):
+        idx, price, reason = simulate_all_methods(
+            close, atr, ha_open, ha_close, stoch_k, stoch_d, vwap, ema15,
+            signal_idx[k], directions[k], entry_option_prices[k],
+            atr_multiple, trail_percentage, fixed_stop, min_holding_bars,
+            ha_exit_min_profit, stoch_exit_overbought, stoch_exit_oversold)
+        exit_idx[k, :] = idx
+        exit_price[k, :] = price
+        exit_reason[k, :] = reason
+    return exit_idx, exit_price, exit_reason
+
+
+def simulate_all_signals_vectorized(close, atr, ha_open, ha_close, stoch_k, stoch_d, vwap, ema15,
+                                    signal_idx, directions, entry_option_prices,
+                                    atr_multiple, trail_percentage, fixed_stop, min_holding_bars,
+                                    ha_exit_min_profit, stoch_exit_overbought, stoch_exit_oversold):
+    """
+    NumPy version of simulate_all_signals for when numba is not installed
+
+    Every trailing stop only ever ratchets up to a function of the running maximum
+    option price, so the stop in force at each bar is a cumulative maximum. The
+    walks of all signals are laid out as one (signals, bars) grid and the first stop
+    hit and first signal exit are found with boolean masks instead of per-bar loops.
+    Same arguments and results as simulate_all_signals.
+    """
+    n = close.shape[0]
+    n_sig = signal_idx.shape[0]
+    start = signal_idx[:, None]
+    direction = directions[:, None]
+    entry_option_price = entry_option_prices[:, None]
+    entry_stock_price = close[start]
+    max_bars = np.minimum(30, n - signal_idx)  # Maximum 30 bars or until end of data
+
+    # Initial stop on the option price for each method
+    stop = np.empty((n_sig, N_METHODS), dtype=np.float64)
+    stop[:, METHOD_HA] = entry_option_prices * 0.7  # 30% stop loss
+    stop[:, METHOD_EMA] = entry_option_prices * 0.7
+    atr_stop = entry_option_prices - (atr[signal_idx] * _DELTA * atr_multiple)
+    stop[:, METHOD_ATR] = np.where(entry_option_prices * 0.5 > atr_stop, entry_option_prices * 0.5, atr_stop)
+    fixed = entry_option_prices - fixed_stop
+    stop[:, METHOD_PCT] = entry_option_prices * (1 - trail_percentage / 100)
+    stop[:, METHOD_FIXED] = np.where(0.05 > fixed, 0.05, fixed)  # Minimum 5 cents
+
+    # Bar offsets after entry; bars inside the minimum holding period or past the
+    # walk get a NaN option price, which never sets a maximum, hits a stop or signals
+    bars_held = np.arange(1, 30)
+    bars = np.minimum(start + bars_held, n - 1)
+    checked = (bars_held >= min_holding_bars) & (bars_held < max_bars[:, None])
+
+    # Option price from delta, gamma and time decay (78 bars per day for 5m)
+    stock_prices = close[bars]
+    stock_change = stock_prices - entry_stock_price
+    option_prices = (entry_option_price + direction * (stock_change * _DELTA)
+                     + 0.5 * _GAMMA * (stock_change ** 2))
+    option_prices -= entry_option_price * 0.02 * (bars_held / 78)
+    option_prices = np.where(checked, np.maximum(option_prices, 0.01), np.nan)
+
+    # Stops are raised only on bars that set a new maximum option price
+    running_max = np.fmax.accumulate(np.hstack((entry_option_price, option_prices)), axis=1)
+    new_max = option_prices > running_max[:, :-1]
+    peak = running_max[:, 1:]
+    candidates = np.empty(option_prices.shape + (N_METHODS,), dtype=np.float64)
+    candidates[:, :, METHOD_HA] = np.where(new_max & (bars_held > 1), peak * 0.75, np.nan)
+    candidates[:, :, METHOD_EMA] = np.where(new_max, peak * 0.8, np.nan)
+    candidates[:, :, METHOD_ATR] = np.where(new_max, peak - (atr[bars] * _DELTA * 1.5), np.nan)
+    candidates[:, :, METHOD_PCT] = np.where(new_max, peak * (1 - 0.25), np.nan)
+    candidates[:, :, METHOD_FIXED] = np.where(new_max, peak - 0.50, np.nan)
+
+    # Stop in force at each bar: initial stop raised by every earlier candidate
+    # (a missing initial stop never triggers and is never raised)
+    stops = np.fmax.accumulate(np.concatenate((stop[:, None, :], candidates[:, :-1, :]), axis=1), axis=1)
+    stops = np.where(np.isnan(stop)[:, None, :], np.nan, stops)
+    hit = option_prices[:, :, None] <= stops
+    first_hit = np.where(hit.any(axis=1), hit.argmax(axis=1), bars_held.shape[0])
+
+    # Signal exits for every bar
+    pnl_pct = ((option_prices - entry_option_price) / entry_option_price) * 100
+    bullish = direction == 1
+    bearish = direction == -1
+    ho = ha_open[bars]
+    hc = ha_close[bars]
+    ha_reversal = (bullish & (ho > hc)) | (bearish & (ho < hc))
+    ha_profit = ha_reversal & (pnl_pct >= ha_exit_min_profit)
+    ha_cut_loss = ha_reversal & ~ha_profit & (pnl_pct < -10)
+
+    k = stoch_k[bars]
+    d = stoch_d[bars]
+    prev_k = np.where(bars_held > 1, stoch_k[bars - 1], k)
+    prev_d = np.where(bars_held > 1, stoch_d[bars - 1], d)
+    stoch_down = bullish & (k > stoch_exit_overbought) & (prev_k > prev_d) & (k < d) & (pnl_pct > 0)
+    stoch_up = bearish & (k < stoch_exit_oversold) & (prev_k < prev_d) & (k > d) & (pnl_pct > 0)
+
+    v = vwap[bars]
+    e = ema15[bars]
+    has_levels = ~(np.isnan(v) | np.isnan(e))
+    below = bullish & has_levels & (stock_prices < np.minimum(v, e)) & (pnl_pct > -5)
+    above = bearish & has_levels & (stock_prices > np.maximum(v, e)) & (pnl_pct > -5)
+
+    reasons = np.select([ha_profit, ha_cut_loss, stoch_down, stoch_up, below, above],
+                        [EXIT_HA_PROFIT, EXIT_HA_CUT_LOSS, EXIT_STOCH_DOWN, EXIT_STOCH_UP,
+                         EXIT_BELOW_VWAP_EMA, EXIT_ABOVE_VWAP_EMA], -1)
+    signalled = reasons >= 0
+    signal_at = np.where(signalled.any(axis=1), signalled.argmax(axis=1), bars_held.shape[0])[:, None]
+
+    # Max bars or end of data: exit at the last simulated close
+    full_walk = signal_idx + max_bars < n
+    last_idx = np.where(full_walk, signal_idx + max_bars - 1, n - 1)
+    final_bars = np.where(full_walk, max_bars, n - signal_idx - 1)
+    final_stock_change = close[last_idx] - entry_stock_price[:, 0]
+    final_option_price = (entry_option_prices + directions * (final_stock_change * _DELTA)
+                          + 0.5 * _GAMMA * (final_stock_change ** 2))
+    final_option_price -= entry_option_prices * 0.02 * (final_bars / 78)
+    final_option_price = np.where(0.01 > final_option_price, 0.01, final_option_price)
+
+    # A stop hit on the signal bar is checked before the signal exit
+    rows = np.arange(n_sig)[:, None]
+    stopped = (first_hit <= signal_at) & (first_hit < bars_held.shape[0])
+    signal_exit = ~stopped & (signal_at < bars_held.shape[0])
+    hit_at = np.minimum(first_hit, bars_held.shape[0] - 1)
+    signal_bar = np.minimum(signal_at, bars_held.shape[0] - 1)
+
+    exit_idx = np.where(stopped, start + 1 + first_hit,
+                        np.where(signal_exit, start + 1 + signal_at, last_idx[:, None]))
+    exit_price = np.where(stopped, stops[rows, hit_at, np.arange(N_METHODS)],
+                          np.where(signal_exit, option_prices[rows, signal_bar], final_option_price[:, None]))
+    exit_reason = np.where(stopped, EXIT_STOP,
+                           np.where(signal_exit, reasons[rows, signal_bar], EXIT_MAX_BARS))
+    return (exit_idx.astype(np.int64), exit_price.astype(np.float64), exit_reason.astype(np.int64))
+
+
+@njit(cache=True)
+def equity_drawdown(initial_equity, pnl):
+    """
+    Final equity and maximum drawdown of equity curves built from per-trade P&L
+
+    Equity, running peak and drawdown are advanced together trade by trade, so the
+    curves themselves are never stored.
+
+    Args:
+        initial_equity (float): Starting equity of every curve
+        pnl (ndarray): C-contiguous float64 P&L of shape (curves, trades)
+
+    Returns:
+        tuple: (final_equity, max_drawdown_pct) arrays, one value per curve
+    """
+    n_curves = pnl.shape[0]
+    final_equity = np.empty(n_curves, dtype=np.float64)
+    max_dd_pct = np.empty(n_curves, dtype=np.float64)
+    for t in range(n_curves):
+        equity = initial_equity
+        peak = initial_equity
+        max_dd = 0.0
+        for k in range(pnl.shape[1]):
+            equity += pnl[t, k]
+            peak = peak if peak >= equity else equity
+            dd = (peak - equity) / peak if equity < peak and peak > 0 else 0.0
+            max_dd = max_dd if max_dd >= dd else dd
+        final_equity[t] = equity
+        max_dd_pct[t] = max_dd * 100
+    return final_equity, max_dd_pct
+
+
+@njit(cache=True)
+def rolling_mean(values, period):
+    """
+    Simple moving average computed like TA-Lib's SMA, with one running sum
+
+    Leading NaNs are skipped and the output is NaN until the first full window. A NaN
+    after that stays in the running sum, unlike Series.rolling().mean(), so callers
+    should use pandas for series with gaps.
+
+    Args:
+        values (ndarray): float64 input series
+        period (int): Window length
+
+    Returns:
+        ndarray: Moving average, same length as values
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    begin = 0
+    while begin < n and np.isnan(values[begin]):
+        begin += 1
+    start = begin + period - 1
+    if start >= n:
+        return out
+
+    total = 0.0
+    for i in range(begin, start):
+        total += values[i]
+    trailing = begin
+    for i in range(start, n):
+        total += values[i]
+        out[i] = total / period
+        total -= values[trailing]
+        trailing += 1
+    return out
+
+
+@njit(cache=True)
+def ewm_mean(values, span):
+    """
+    Exponential moving average in one pass, matching Series.ewm(span=span, adjust=False).mean()
+
+    Uses the same update as pandas, including its alpha from span and the skipped update
+    on an unchanged value. Leading NaNs are fine; across interior NaN gaps pandas versions
+    differ in how they reweight, so callers should use pandas for series with gaps.
+
+    Args:
+        values (ndarray): float64 input series
+        span (int): EMA span
+
+    Returns:
+        ndarray: Exponential moving average, NaN until the first observation
+    """
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+
+    alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+    old_wt_factor = 1.0 - alpha
+    old_wt = 1.0
+    weighted = values[0]
+    observed = weighted == weighted
+    out[0] = weighted if observed else np.nan
+    for i in range(1, n):
+        cur = values[i]
+        is_observation = cur == cur
+        observed = observed or is_observation
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_observation:
+                if weighted != cur:
+                    weighted = old_wt * weighted + alpha * cur
+                    weighted /= old_wt + alpha
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted if observed else np.nan
+    return out
+
+
+@njit(cache=True, error_model='numpy')
+def bollinger_width(close, window, num_std):
+    """
+    Bollinger Band width, (upper - lower) / middle, in one rolling pass
+
+    The middle band and the sample deviation are updated together as the window
+    slides, with the same compensated running sum and Welford variance updates as
+    Series.rolling(window).mean() / .std(), so no intermediate band arrays are built.
+    Results agree with pandas to rounding; windows holding NaNs are not supported.
+
+    Args:
+        close (ndarray): float64 close prices
+        window (int): Window for moving average
+        num_std (int): Number of standard deviations
+
+    Returns:
+        ndarray: Band width, NaN until the window holds `window` valid values
+    """
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    if n == 0:
+        return out
+
+    # Running sum state (Kahan compensated, as in pandas' rolling mean)
+    nobs = 0
+    sum_x = 0.0
+    neg_ct = 0
+    add_comp = 0.0
+    remove_comp = 0.0
+    # Welford state (as in pandas' rolling variance)
+    mean_x = 0.0
+    ssqdm_x = 0.0
+    var_add_comp = 0.0
+    var_remove_comp = 0.0
+    # A window of identical values gives exactly that value as its mean
+    same_run = 0
+    prev_value = close[0]
+
+    for i in range(n):
+        if i >= window:
+            value = close[i - window]
+            if value == value:
+                nobs -= 1
+                y = -value - remove_comp
+                t = sum_x + y
+                remove_comp = t - sum_x - y
+                sum_x = t
+                if value < 0 or (value == 0 and np.signbit(value)):
+                    neg_ct -= 1
+                if nobs:
+                    prev_mean = mean_x - var_remove_comp
+                    y = value - var_remove_comp
+                    t = y - mean_x
+                    var_remove_comp = t + mean_x - y
+                    mean_x = mean_x - t / nobs
+                    ssqdm_x = ssqdm_x - (value - prev_mean) * (value - mean_x)
+                else:
+                    mean_x = 0.0
+                    ssqdm_x = 0.0
+
+        value = close[i]
+        if value == value:
+            nobs += 1
+            y = value - add_comp
+            t = sum_x + y
+            add_comp = t - sum_x - y
+            sum_x = t
+            if np.signbit(value):
+                neg_ct += 1
+            if value == prev_value:
+                same_run += 1
+            else:
+                same_run = 1
+            prev_value = value
+
+            prev_mean = mean_x - var_add_comp
+            y = value - var_add_comp
+            t = y - mean_x
+            var_add_comp = t + mean_x - y
+            mean_x = mean_x + t / nobs
+            ssqdm_x = ssqdm_x + (value - prev_mean) * (value - mean_x)
+
+        if nobs < window:
+            continue
+
+        middle = sum_x / nobs
+        if same_run >= nobs:
+            middle = prev_value
+        elif neg_ct == 0 and middle < 0:
+            middle = 0.0
+        elif neg_ct == nobs and middle > 0:
+            middle = 0.0
+
+        variance = ssqdm_x / (nobs - 1)
+        std = np.sqrt(variance) if variance >= 0 else 0.0
+        upper = middle + (std * num_std)
+        lower = middle - (std * num_std)
+        out[i] = (upper - lower) / middle
+    return out
+
+
+@njit(cache=True)
+def rolling_max(values, period):
+    """Rolling maximum over full windows (NaN when the window holds a NaN), like Series.rolling().max()"""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(period - 1, n):
+        highest = values[i]
+        for j in range(i - period + 1, i):
+            value = values[j]
+            if np.isnan(value) or value > highest:
+                highest = value
+            if np.isnan(highest):
+                break
+        out[i] = highest
+    return out
+
+
+@njit(cache=True)
+def rolling_min(values, period):
+    """Rolling minimum over full windows (NaN when the window holds a NaN), like Series.rolling().min()"""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(period - 1, n):
+        lowest = values[i]
+        for j in range(i - period + 1, i):
+            value = values[j]
+            if np.isnan(value) or value < lowest:
+                lowest = value
+            if np.isnan(lowest):
+                break
+        out[i] = lowest
+    return out
+
+
+@njit(cache=True)
+def _fmax(a, b):
+    """np.fmax for scalars: the larger value, ignoring a NaN operand"""
+    if np.isnan(a):
+        return b
+    if np.isnan(b):
+        return a
+    return a if a >= b else b
+
+
+@njit(cache=True)
+def _fmin(a, b):
+    """np.fmin for scalars: the smaller value, ignoring a NaN operand"""
+    if np.isnan(a):
+        return b
+    if np.isnan(b):
+        return a
+    return a if a <= b else b
+
+
+@njit(cache=True)
+def heiken_ashi(open_, high, low, close):
+    """
+    Heiken Ashi candles in a single pass over the price arrays
+
+    Open is the midpoint of the previous candle's body (this candle's open when
+    unavailable), close the OHLC average, and high/low the extremes of high or low,
+    open and close.
+
+    Args:
+        open_, high, low, close (ndarray): float64 price series
+
+    Returns:
+        tuple: (ha_open, ha_close, ha_high, ha_low) arrays
+    """
+    n = close.shape[0]
+    ha_open = np.empty(n, dtype=np.float64)
+    ha_close = np.empty(n, dtype=np.float64)
+    ha_high = np.empty(n, dtype=np.float64)
+    ha_low = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        ha_open[i] = open_[i]
+        if i > 0:
+            prev_mid = (open_[i - 1] + close[i - 1]) / 2
+            if not np.isnan(prev_mid):
+                ha_open[i] = prev_mid
+        ha_close[i] = (open_[i] + high[i] + low[i] + close[i]) / 4
+        ha_high[i] = _fmax(_fmax(high[i], open_[i]), close[i])
+        ha_low[i] = _fmin(_fmin(low[i], open_[i]), close[i])
+    return ha_open, ha_close, ha_high, ha_low
+
+
+def _drawdown_fractions(peak, equity):
+    """(peak - equity) / peak, dividing only below a positive peak; everything else is 0"""
+    return np.divide(peak - equity, peak, out=np.zeros_like(equity), where=(equity < peak) & (peak > 0))
+
+
+def equity_drawdown_vectorized(initial_equity, pnl):
+    """NumPy version of equity_drawdown: builds the curves with one cumsum, then reduces them"""
+    curves = np.cumsum(np.concatenate((np.full((pnl.shape[0], 1), initial_equity), pnl), axis=1), axis=1)
+    peak = np.maximum.accumulate(curves, axis=1)
+    return curves[:, -1].copy(), _drawdown_fractions(peak, curves).max(axis=1) * 100
+
+
+if not NUMBA_AVAILABLE:
+    # Without compilation, one grid pass over all signals beats a per-bar Python loop per signal
+    simulate_all_signals = simulate_all_signals_vectorized
+    equity_drawdown = equity_drawdown_vectorized
@@ -1,49 +1,36 @@
 # Code/bot_core/backtest_directory_manager.py
 
 import os
-from datetime import datetime
-from pathlib import Path
+import itertools
+import threading
+import time
+from datetime import date
 
-class BacktestDirectoryManager:
-    """Manages the directory structure for backtest data and results"""
-    
-    def __init__(self):
-        # Base directory for all backtest data
-        self.base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Backtest_Data'))
-        
-        # Subdirectories
-        self.historical_data_dir = os.path.join(self.base_dir, 'Historical_Data')
-        self.results_dir = os.path.join(self.base_dir, 'Results')
-        self.analysis_dir = os.path.join(self.base_dir, 'Analysis')
-        self.logs_dir = os.path.join(self.base_dir, 'Logs')
-        
-        # Create directory structure
-        self._create_directories()
-        
-    def _create_directories(self):
-        """Create the directory structure if it doesn't exist"""
-        directories = [
-            self.base_dir,
-            self.historical_data_dir,
-            os.path.join(self.historical_data_dir, 'YFinance'),
-            os.path.join(self.historical_data_dir, 'TastyTrade'),  # Changed from 'Alpaca'
-            self.results_dir,
-            os.path.join(self.results_dir, 'Summary'),
-            os.path.join(self.results_dir, 'Trades'),
-            self.analysis_dir,
-            self.logs_dir
-        ]
-        
-        for directory in directories:
-            os.makedirs(directory, exist_ok=True)
-            
-        # Create README files to explain directory structure
-        self._create_readme_files()
-    
-    def _create_readme_files(self):
-        """Create README files in each directory"""
-        readme_content = {
-            self.base_dir: """# Backtest Data Directory
+# Static directory layout, resolved once at import time
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_BASE_DIR = os.path.normpath(os.path.join(_MODULE_DIR, '..', '..', 'Backtest_Data'))
+_HISTORICAL_DATA_DIR = os.path.join(_BASE_DIR, 'Historical_Data')
+_RESULTS_DIR = os.path.join(_BASE_DIR, 'Results')
+_ANALYSIS_DIR = os.path.join(_BASE_DIR, 'Analysis')
+_LOGS_DIR = os.path.join(_BASE_DIR, 'Logs')
+_SUMMARY_DIR = os.path.join(_RESULTS_DIR, 'Summary')
+_TRADES_DIR = os.path.join(_RESULTS_DIR, 'Trades')
+
+# Parent-first creation order
+_DIRECTORIES = (
+    _BASE_DIR,
+    _HISTORICAL_DATA_DIR,
+    os.path.join(_HISTORICAL_DATA_DIR, 'YFinance'),
+    os.path.join(_HISTORICAL_DATA_DIR, 'TastyTrade'),  # Changed from 'Alpaca'
+    _RESULTS_DIR,
+    _SUMMARY_DIR,
+    _TRADES_DIR,
+    _ANALYSIS_DIR,
+    _LOGS_DIR,
+)
+
+_README_CONTENT = {
+    _BASE_DIR: """# Backtest Data Directory
 
 This directory contains all backtest-related data and results.
 
@@ -57,7 +44,7 @@ This directory contains all backtest-related data and results.
 - **Analysis/**: Detailed analysis files and charts
 - **Logs/**: Backtest execution logs
 """,
-            self.historical_data_dir: """# Historical Data
+    _HISTORICAL_DATA_DIR: """# Historical Data
 
 This directory stores raw market data fetched from different sources.
 
@@ -66,7 +53,7 @@ Files are saved as: `{SYMBOL}_{TIMEFRAME}_{START_DATE}_{END_DATE}_{SOURCE}.csv`
 
 Example: `SPY_5m_2024-01-01_2024-01-31_TastyTrade.csv`
 """,
-            self.results_dir: """# Backtest Results
+    _RESULTS_DIR: """# Backtest Results
 
 This directory contains backtest results and performance metrics.
 
@@ -74,25 +61,125 @@ This directory contains backtest results and performance metrics.
 - **Summary/**: High-level statistics and performance metrics
 - **Trades/**: Detailed trade-by-trade logs with entry/exit points
 """
-        }
+}
+
+_README_BYTES = {directory: content.encode('utf-8') for directory, content in _README_CONTENT.items()}
+
+# Everything below the base directory as (directory, README bytes or None), parent first
+_BOOTSTRAP_TARGETS = tuple((d, _README_BYTES.get(d)) for d in _DIRECTORIES[1:])
+
+# Same targets relative to the base directory, for directory-relative syscalls
+# (mkdirat/openat) that resolve the base path only once
+_RELATIVE_BOOTSTRAP_TARGETS = tuple((os.path.relpath(d, _BASE_DIR), readme) for d, readme in _BOOTSTRAP_TARGETS)
+_USE_DIR_FD = os.mkdir in os.supports_dir_fd and os.open in os.supports_dir_fd
+
+# Process-wide sequence appended to run IDs (after the process ID) so rapid
+# successive runs stay unique within and across processes
+_run_id_counter = itertools.count()
+
+class BacktestDirectoryManager:
+    """Manages the directory structure for backtest data and results"""
+    
+    # Base directories whose structure has already been created in this process
+    _initialized = set()
+    # Individual directories already ensured in this process
+    _created_dirs = set()
+    _init_lock = threading.Lock()
+    
+    def __init__(self):
+        # Base directory for all backtest data
+        self.base_dir = _BASE_DIR
+        
+        # Subdirectories
+        self.historical_data_dir = _HISTORICAL_DATA_DIR
+        self.results_dir = _RESULTS_DIR
+        self.analysis_dir = _ANALYSIS_DIR
+        self.logs_dir = _LOGS_DIR
+        self._summary_dir = _SUMMARY_DIR
+        self._trades_dir = _TRADES_DIR
+        
+        # Per-source historical data directories, joined on first use
+        self._source_dirs = {}
+        
+        # Directory structure is created lazily on first path request (see _ensure)
         
-        for directory, content in readme_content.items():
-            readme_path = os.path.join(directory, 'README.md')
-            if not os.path.exists(readme_path):
-                with open(readme_path, 'w') as f:
-                    f.write(content)
+    def _ensure(self, directory):
+        """Make sure a directory exists, creating the base structure on first use"""
+        if directory in BacktestDirectoryManager._created_dirs:
+            return
+        
+        with BacktestDirectoryManager._init_lock:
+            if self.base_dir not in BacktestDirectoryManager._initialized:
+                self._create_directories()
+                BacktestDirectoryManager._initialized.add(self.base_dir)
+            
+            try:
+                os.makedirs(directory)
+            except FileExistsError:
+                pass
+            BacktestDirectoryManager._created_dirs.add(directory)
+        
+    def _create_directories(self):
+        """Create the directory structure and README files if they don't exist"""
+        # Only the base directory may need its own missing parents created
+        try:
+            os.mkdir(self.base_dir)
+        except FileExistsError:
+            pass
+        except FileNotFoundError:
+            os.makedirs(self.base_dir)
+        
+        # Resolve the base path once and create everything relative to it when supported
+        if _USE_DIR_FD:
+            base_fd = os.open(self.base_dir, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+            targets = _RELATIVE_BOOTSTRAP_TARGETS
+            base_name = os.curdir
+        else:
+            base_fd = None
+            targets = _BOOTSTRAP_TARGETS
+            base_name = self.base_dir
+        
+        try:
+            self._create_readme_file(base_name, _README_BYTES[_BASE_DIR], base_fd)
+            
+            # Single pass: each directory followed by its README, if it has one
+            for directory, readme in targets:
+                try:
+                    os.mkdir(directory, dir_fd=base_fd)
+                except FileExistsError:
+                    pass
+                if readme is not None:
+                    self._create_readme_file(directory, readme, base_fd)
+        finally:
+            if base_fd is not None:
+                os.close(base_fd)
+    
+    def _create_readme_file(self, directory, content, base_fd=None):
+        """Create a README file explaining a directory (relative to base_fd when given)"""
+        # Exclusive create: a single open() both checks and creates the file
+        try:
+            fd = os.open(os.path.join(directory, 'README.md'),
+                         os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644, dir_fd=base_fd)
+        except FileExistsError:
+            return
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
     
     def get_historical_data_path(self, symbol, timeframe, start_date, end_date, source):
         """Get the path for historical data file"""
-        source_dir = os.path.join(self.historical_data_dir, source)
-        
-        # Create source directory if it doesn't exist
-        os.makedirs(source_dir, exist_ok=True)
+        source_dir = self._source_dirs.get(source)
+        if source_dir is None:
+            source_dir = os.path.join(self.historical_data_dir, source)
+            # Create source directory if it doesn't exist (once per source)
+            self._ensure(source_dir)
+            self._source_dirs[source] = source_dir
         
         # Convert dates to string format if they're date objects
-        if hasattr(start_date, 'strftime'):
+        if isinstance(start_date, date):
             start_date = start_date.strftime('%Y-%m-%d')
-        if hasattr(end_date, 'strftime'):
+        if isinstance(end_date, date):
             end_date = end_date.strftime('%Y-%m-%d')
         
         filename = f"{symbol}_{timeframe}_{start_date}_{end_date}_{source}.csv"
@@ -100,10 +187,8 @@ This directory contains backtest results and performance metrics.
     
     def get_results_path(self, run_id, result_type='summary'):
         """Get the path for results file"""
-        if result_type == 'summary':
-            directory = os.path.join(self.results_dir, 'Summary')
-        else:
-            directory = os.path.join(self.results_dir, 'Trades')
+        directory = self._summary_dir if result_type == 'summary' else self._trades_dir
+        self._ensure(directory)
         
         filename = f"{run_id}_{result_type}.csv"
         return os.path.join(directory, filename)
@@ -115,13 +200,37 @@ This directory contains backtest results and performance metrics.
             filename = f"{run_id}_{analysis_type}"
         else:
             filename = f"{run_id}_{analysis_type}.csv"
+        self._ensure(self.analysis_dir)
         return os.path.join(self.analysis_dir, filename)
     
     def get_log_path(self, run_id):
         """Get the path for log file"""
+        self._ensure(self.logs_dir)
+        
         filename = f"{run_id}_backtest.log"
         return os.path.join(self.logs_dir, filename)
     
     def generate_run_id(self):
         """Generate a unique run ID for this backtest"""
-        return datetime.now().strftime('%Y%m%d_%H%M%S')
\ No newline at end of file
+        t = time.localtime()
+        return (f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}_"
+                f"{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}_{os.getpid()}_{next(_run_id_counter):04d}")
+
+
+# Singleton instance of BacktestDirectoryManager
+_instance = None
+
+def get_directory_manager() -> BacktestDirectoryManager:
+    """
+    Get a singleton instance of BacktestDirectoryManager.
+    
+    The runner, engine and candle data client all use it, so the manager is only
+    set up once per process.
+    
+    Returns:
+        BacktestDirectoryManager: Instance of BacktestDirectoryManager
+    """
+    global _instance
+    if _instance is None:
+        _instance = BacktestDirectoryManager()
+    return _instance
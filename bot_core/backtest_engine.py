@@ -6,10 +6,170 @@ import numpy as np
 import json
 from datetime import datetime, timedelta
 import logging
-import csv
-from pathlib import Path
+import logging.handlers
+import multiprocessing
+import queue
+import atexit
+import itertools
+import operator
+from contextlib import contextmanager
+import hashlib
+import importlib.util
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from Code.bot_core.mag7_strategy import Mag7Strategy
 
+try:
+    import talib
+except ImportError:
+    talib = None  # Indicators fall back to pandas rolling windows
+from Code.bot_core._nb_kernels import (
+    NUMBA_AVAILABLE,
+    simulate_all_methods, simulate_all_signals, equity_drawdown,
+    heiken_ashi, ewm_mean, rolling_mean, rolling_max, rolling_min, bollinger_width,
+    EXIT_REASONS, N_METHODS, METHOD_NAMES,
+)
+
+# Signal direction codes used by the vectorised signal scan
+DIRECTION_CODES = {"bullish": 1, "bearish": -1, "neutral": 0}
+DIRECTION_NAMES = {1: "bullish", -1: "bearish", 0: "neutral"}
+
+# Why a candle was skipped, by the cascade stage it failed
+SKIP_NONE = 0
+SKIP_WARMUP = 1
+SKIP_END_OF_DATA = 2
+SKIP_NO_ALIGNMENT = 3
+SKIP_NO_COMPRESSION = 4
+SKIP_NO_MOMENTUM = 5
+SKIP_NO_TREND = 6
+SKIP_NO_ENTRY = 7
+
+# Rows formatted and written per block when streaming the analysis CSV
+_ANALYSIS_BLOCK_ROWS = 10000
+
+# Write buffer for CSV outputs, so large files go out in few write() calls
+_CSV_BUFFER_SIZE = 1 << 20
+
+# Per-ticker result fields read by the summary writer, with the default used when missing
+_SUMMARY_DEFAULTS = {
+    'Win Rate': 0,
+    'Profit Factor': 0,
+    'Max Drawdown': 0,
+    'Total Trades': 0,
+    'Winning Trades': 0,
+    'Losing Trades': 0,
+    'Gross Profit': 0,
+    'Gross Loss': 0,
+    'Final Equity': 10000,
+    'Trades': (),
+    'Optimal Trailing Method': 'Unknown',
+}
+_summary_fields = operator.itemgetter(*_SUMMARY_DEFAULTS)
+
+# Fixed skip reason text by SKIP_* code (None where the text depends on the candle)
+_SKIP_REASON_TEXT = np.array([None, 'Warmup period', 'End of data', None, None, None, None, None], dtype=object)
+
+# Exit reason text indexed by the simulators' reason codes
+_EXIT_REASON_TEXT = np.array(EXIT_REASONS, dtype=object)
+
+# Computed indicators are cached as Parquet under Backtest_Data; without pyarrow the cache is off
+_INDICATOR_CACHE_SUBDIR = 'Indicator_Cache'
+_INDICATOR_CACHE_PARQUET = importlib.util.find_spec('pyarrow') is not None
+# Bump when any indicator formula or parameter changes so old cache files are ignored
+_INDICATOR_CACHE_VERSION = "2:ema9,ema15,vwap,bbwidth20x2,stoch5/3/2,atr14,ha"
+_INDICATOR_COLUMNS = ['ema9', 'ema15', 'vwap', 'bb_width', 'stoch_k', 'stoch_d', 'atr']
+_HA_COLUMNS = ['open', 'close', 'high', 'low']
+
+
+# Background threads writing queued log records to their files
+_log_listeners = []
+
+
+def _queued_file_handler(log_file, formatter):
+    """
+    Build a handler that only queues records; a listener thread writes them to log_file
+
+    Args:
+        log_file (str): Log file path
+        formatter (logging.Formatter): Formatter for the file output
+
+    Returns:
+        logging.handlers.QueueHandler: Handler to attach to the logger
+    """
+    log_queue = queue.Queue(-1)
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(formatter)
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    _log_listeners.append(listener)
+    return logging.handlers.QueueHandler(log_queue)
+
+
+def _stop_log_listeners():
+    """Flush every queued log record to disk and stop the listener threads"""
+    while _log_listeners:
+        listener = _log_listeners.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(_stop_log_listeners)
+
+
+class _LoggerDispatchHandler(logging.Handler):
+    """Hand records forwarded from worker processes to this process's logger of the same name"""
+    
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+
+def _init_backtest_worker(log_queue, run_id):
+    """
+    Set up a backtest worker process
+
+    Log records go back to the parent through log_queue, where a single listener
+    writes them to the engine and run logs, and numba runs its parallel kernels on
+    one thread since every worker process already has its own core.
+
+    Args:
+        log_queue (multiprocessing.Queue): Queue drained by the parent's listener
+        run_id (str): Run ID shared by every ticker of the run
+    """
+    # Listeners inherited from a forked parent belong to the parent's threads
+    _log_listeners.clear()
+    for name in ("BacktestEngine", f"BacktestEngine_{run_id}"):
+        worker_logger = logging.getLogger(name)
+        worker_logger.handlers.clear()
+        worker_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    if NUMBA_AVAILABLE:
+        import numba
+        numba.set_num_threads(1)
+
+
+def _run_ticker_in_worker(candle_data_client, config, run_id, show_config_table,
+                          symbol, period, start_date, end_date, data_source):
+    """
+    Run one ticker's backtest in a worker process with a freshly built engine
+
+    Only the candle client, config and run ID cross the process boundary; the
+    engine and directory manager are recreated in the worker, and its loggers
+    forward to the parent (see _init_backtest_worker).
+
+    Returns:
+        dict: Backtest results for the ticker
+    """
+    from Code.bot_core.backtest_directory_manager import get_directory_manager
+
+    engine = BacktestEngine(candle_data_client=candle_data_client, config=config)
+    engine.dir_manager = get_directory_manager()
+    engine.run_id = run_id
+    if not show_config_table:
+        engine._config_table_shown = True
+    return engine.run_backtest_for_ticker(symbol, period, start_date, end_date, data_source)
+
 class BacktestEngine:
     """
     Engine for running backtests on historical market data
@@ -28,6 +188,7 @@ class BacktestEngine:
         self.jigsaw_strategy = jigsaw_strategy
         self.config = config or {}
         self.trading_config = self.config.get('trading_config', {})
+        self._load_signal_thresholds()
         
         # Setup logging
         today = datetime.now().strftime("%Y-%m-%d")
@@ -39,28 +200,43 @@ class BacktestEngine:
         self.logger.setLevel(logging.INFO)
         if not self.logger.handlers:
             # Initialize directory manager
-            from Code.bot_core.backtest_directory_manager import BacktestDirectoryManager
-            self.dir_manager = BacktestDirectoryManager()
+            from Code.bot_core.backtest_directory_manager import get_directory_manager
+            self.dir_manager = get_directory_manager()
             self.run_id = self.dir_manager.generate_run_id()
-            handler = logging.FileHandler(log_file)
             formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
+            handler = _queued_file_handler(log_file, formatter)
             self.logger.addHandler(handler)
     
-    def run_backtest(self, tickers, period, start_date, end_date, data_source="YFinance"):
+    def run_backtest(self, tickers, period, start_date, end_date, data_source="YFinance", max_workers=1):
         """
         Run a backtest for the specified tickers and period
         
+        Tickers run one after another in this process unless max_workers asks
+        for more than one worker. Tickers are independent, so they then run in
+        separate processes. If the candle client cannot be sent to a worker
+        process the sequential path is used instead.
+        
         Args:
             tickers (list): List of tickers to backtest
             period (int): Timeframe period in minutes
             start_date (str): Start date in ISO format
             end_date (str): End date in ISO format
             data_source (str): Data source to use ('YFinance' or 'TastyTrade')
+            max_workers (int, optional): Worker processes to use (default: 1, runs sequentially;
+                None uses one per CPU)
             
         Returns:
             dict: Backtest results by ticker
         """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(tickers))
+        
+        if max_workers > 1:
+            results = self._run_backtest_parallel(tickers, period, start_date, end_date, data_source, max_workers)
+            if results is not None:
+                return results
+        
         results = {}
         
         for ticker in tickers:
@@ -73,6 +249,82 @@ class BacktestEngine:
     
     
 
+    def _ensure_run_logger(self):
+        """Create the logger that writes this run's log file, if it does not exist yet"""
+        if hasattr(self, 'run_logger'):
+            return
+        
+        run_log_path = self.dir_manager.get_log_path(self.run_id)
+        self.run_logger = logging.getLogger(f"BacktestEngine_{self.run_id}")
+        self.run_logger.setLevel(logging.INFO)
+        
+        # Add handler if not present
+        if not self.run_logger.handlers:
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            handler = _queued_file_handler(run_log_path, formatter)
+            self.run_logger.addHandler(handler)
+
+    def _run_backtest_parallel(self, tickers, period, start_date, end_date, data_source, max_workers):
+        """
+        Run tickers in a process pool
+        
+        Args:
+            tickers (list): List of tickers to backtest
+            period (int): Timeframe period in minutes
+            start_date (str): Start date in ISO format
+            end_date (str): End date in ISO format
+            data_source (str): Data source to use
+            max_workers (int): Number of worker processes
+            
+        Returns:
+            dict or None: Backtest results by ticker, or None if the run could not be parallelised
+        """
+        try:
+            pickle.dumps((self.candle_data_client, self.config))
+        except Exception as e:
+            self.logger.info(f"Running tickers sequentially, candle client is not picklable: {e}")
+            return None
+        
+        # Every ticker writes to this run's log, so the run ID is fixed before the workers start
+        if not hasattr(self, 'dir_manager'):
+            from Code.bot_core.backtest_directory_manager import get_directory_manager
+            self.dir_manager = get_directory_manager()
+        if not hasattr(self, 'run_id'):
+            self.run_id = self.dir_manager.generate_run_id()
+        run_id = self.run_id
+        self._ensure_run_logger()
+        show_config_table = not hasattr(self, '_config_table_shown')
+        
+        # Workers send their log records here; one listener hands them to this process's loggers
+        log_queue = multiprocessing.Queue(-1)
+        log_listener = logging.handlers.QueueListener(log_queue, _LoggerDispatchHandler())
+        log_listener.start()
+        
+        print(f"[*] Running backtest for {len(tickers)} tickers with {period}m candles across {max_workers} processes...")
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_backtest_worker,
+                                     initargs=(log_queue, run_id)) as executor:
+                futures = {}
+                for n, ticker in enumerate(tickers):
+                    self.logger.info(f"Running backtest for {ticker} with {period}m candles...")
+                    futures[ticker] = executor.submit(
+                        _run_ticker_in_worker, self.candle_data_client, self.config, run_id,
+                        show_config_table and n == 0, ticker, period, start_date, end_date, data_source)
+                
+                # Collect in ticker order so results match a sequential run
+                results = {f"{ticker}_{period}m": future.result() for ticker, future in futures.items()}
+        except (BrokenProcessPool, OSError, pickle.PicklingError) as e:
+            self.logger.warning(f"Process pool unavailable, running tickers sequentially: {e}")
+            print(f"[!] Parallel backtest unavailable ({e}), running sequentially")
+            return None
+        finally:
+            log_listener.stop()
+            log_queue.close()
+        
+        if show_config_table:
+            self._config_table_shown = True
+        return results
+
     def _calculate_option_price_delta_based(self, stock_price, strike_price=None, option_type="call", dte=7, iv=0.25):
         """
         Calculate option price using simplified Black-Scholes approximation
@@ -225,6 +477,9 @@ class BacktestEngine:
             # Get configuration values
             use_mag7 = self.trading_config.get("use_mag7_confirmation", False)
             
+            # Read per-candle thresholds once instead of on every helper call
+            self._load_signal_thresholds()
+            
             # Get historical candle data with better error handling
             if not self.candle_data_client:
                 self.logger.error("No candle data client provided")
@@ -232,7 +487,7 @@ class BacktestEngine:
             
             # Pass config to candle_data_client
             self.candle_data_client.config = self.config
-                
+            
             # Fetch data from the selected source
             candles = self.candle_data_client.get_candles_for_backtesting(
                 [symbol], 
@@ -254,18 +509,8 @@ class BacktestEngine:
                 last_date = candles[-1].get('timestamp', candles[-1].get('start_time', 'Unknown'))
                 print(f"[*] Data range: {first_date} to {last_date}")
             
-            # Convert to DataFrame for analysis
-            df = pd.DataFrame(candles)
-            
-            # Standardize column names
-            col_map = {
-                'Open': 'open', 
-                'High': 'high', 
-                'Low': 'low', 
-                'Close': 'close',
-                'Volume': 'volume'
-            }
-            df = df.rename(columns={k: v for k, v in col_map.items() if k in df.columns})
+            # Convert to a typed DataFrame for analysis
+            df = self._candles_to_df(candles)
             
             # Ensure all required columns exist
             required_cols = ['open', 'high', 'low', 'close']
@@ -274,26 +519,14 @@ class BacktestEngine:
                 self.logger.error(f"Missing required columns: {missing_cols}")
                 return self._get_empty_result()
             
-            # Convert data to appropriate types
-            for col in ['open', 'high', 'low', 'close']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            if 'volume' in df.columns:
-                df['volume'] = pd.to_numeric(df['volume'], errors='coerce').fillna(0)
-            else:
+            if 'volume' not in df.columns:
                 df['volume'] = 0
                 
             # Add timestamp column if not present
             if 'timestamp' not in df.columns:
-                if 'start_time' in df.columns:
-                    df['timestamp'] = df['start_time']
-                else:
-                    # Generate timestamps based on period
-                    start_dt = pd.to_datetime(start_date)
-                    df['timestamp'] = pd.date_range(start=start_dt, periods=len(df), freq=f'{period}min')
-            
-            # Ensure timestamp is datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+                # Generate timestamps based on period
+                start_dt = pd.to_datetime(start_date)
+                df['timestamp'] = pd.date_range(start=start_dt, periods=len(df), freq=f'{period}min')
             
             # Log DataFrame info
             print(f"[*] DataFrame shape: {df.shape}")
@@ -327,33 +560,10 @@ class BacktestEngine:
                     stock_candles = mag7_result.get(stock, [])
                     
                     if stock_candles:
-                        stock_df = pd.DataFrame(stock_candles)
-                        
-                        # Standardize column names
-                        col_map = {
-                            'Open': 'open', 
-                            'High': 'high', 
-                            'Low': 'low', 
-                            'Close': 'close',
-                            'Volume': 'volume'
-                        }
-                        stock_df = stock_df.rename(columns={k: v for k, v in col_map.items() if k in stock_df.columns})
-                        
-                        # Convert to numeric
-                        for col in ['open', 'high', 'low', 'close']:
-                            if col in stock_df.columns:
-                                stock_df[col] = pd.to_numeric(stock_df[col], errors='coerce')
-                        
-                        # Handle timestamp
-                        if 'timestamp' not in stock_df.columns:
-                            if 'start_time' in stock_df.columns:
-                                stock_df['timestamp'] = stock_df['start_time']
+                        stock_df = self._candles_to_df(stock_candles)
                         
                         if 'timestamp' in stock_df.columns:
-                            stock_df['timestamp'] = pd.to_datetime(stock_df['timestamp'])
-                            stock_df = stock_df.set_index('timestamp')
-                            stock_df = stock_df.reindex(df.set_index('timestamp').index, method='ffill')
-                            stock_df = stock_df.reset_index()
+                            stock_df = self._align_to_candles(stock_df, df['timestamp'])
                         
                         sector_data[stock] = stock_df
                         print(f"[✓] Got {len(stock_df)} candles for {stock}")
@@ -378,35 +588,11 @@ class BacktestEngine:
                     sector_candles = sector_result.get(sector, [])
                     
                     if sector_candles:
-                        sector_df = pd.DataFrame(sector_candles)
-                        
-                        # Standardize column names
-                        col_map = {
-                            'Open': 'open', 
-                            'High': 'high', 
-                            'Low': 'low', 
-                            'Close': 'close',
-                            'Volume': 'volume'
-                        }
-                        sector_df = sector_df.rename(columns={k: v for k, v in col_map.items() if k in sector_df.columns})
-                        
-                        # Convert to numeric
-                        for col in ['open', 'high', 'low', 'close']:
-                            if col in sector_df.columns:
-                                sector_df[col] = pd.to_numeric(sector_df[col], errors='coerce')
-                        
-                        # Add timestamp if needed
-                        if 'timestamp' not in sector_df.columns:
-                            if 'start_time' in sector_df.columns:
-                                sector_df['timestamp'] = sector_df['start_time']
+                        sector_df = self._candles_to_df(sector_candles)
                         
-                        # Ensure timestamp is datetime format
                         if 'timestamp' in sector_df.columns:
-                            sector_df['timestamp'] = pd.to_datetime(sector_df['timestamp'])
                             # Align timestamps with main DataFrame
-                            sector_df = sector_df.set_index('timestamp')
-                            sector_df = sector_df.reindex(df.set_index('timestamp').index, method='ffill')
-                            sector_df = sector_df.reset_index()
+                            sector_df = self._align_to_candles(sector_df, df['timestamp'])
                         
                         sector_data[sector] = sector_df
                         print(f"[✓] Got {len(sector_df)} candles for sector {sector}")
@@ -421,6 +607,16 @@ class BacktestEngine:
                 if len(data_df) != len(df):
                     print(f"    [!] WARNING: Data length mismatch!")
 
+            # Sector/Mag7 closes as one contiguous (candles x symbols) matrix in sector_order
+            sector_order = list(sector_data)
+            sector_close_mat = np.full((len(df), len(sector_order)), np.nan)
+            for k, name in enumerate(sector_order):
+                if 'close' in sector_data[name].columns:
+                    aligned_close = sector_data[name]['close'].to_numpy(dtype=np.float64)[:len(df)]
+                    sector_close_mat[:len(aligned_close), k] = aligned_close
+            self._sector_mat = sector_close_mat
+            self._sector_order = sector_order
+
             # Initialize sector_weights HERE - BEFORE the main loop
             # Get sector weights from config (used for both strategies)
             sector_weights = self.trading_config.get("sector_weights", {
@@ -430,35 +626,47 @@ class BacktestEngine:
                 "XLY": 11
             })
 
-            # Calculate technical indicators first
-            print(f"[*] Calculating technical indicators...")
+            # Calculate technical indicators first, reusing the cached set when the candles are unchanged
+            indicator_cache_path = self._indicator_cache_path(symbol, period, start_date, end_date, data_source)
+            indicator_key = self._indicator_cache_key(df)
+            cached = self._load_cached_indicators(indicator_cache_path, indicator_key, len(df))
+
+            if cached is not None:
+                print(f"[✓] Loaded cached technical indicators for {symbol}")
+                for col in _INDICATOR_COLUMNS:
+                    df[col] = cached[col].to_numpy()
+                ha_df = pd.DataFrame({c: cached[f'ha_{c}'].to_numpy() for c in _HA_COLUMNS}, index=df.index)
+            else:
+                print(f"[*] Calculating technical indicators...")
 
-            # 1. Calculate EMAs
-            df['ema9'] = df['close'].ewm(span=9, adjust=False).mean()
-            df['ema15'] = df['close'].ewm(span=15, adjust=False).mean()
+                # 1. Calculate EMAs (one compiled pass each when numba is installed and closes have no gaps)
+                close_values = df['close'].to_numpy(dtype=np.float64)
+                if NUMBA_AVAILABLE and not np.isnan(close_values).any():
+                    df['ema9'] = ewm_mean(close_values, 9)
+                    df['ema15'] = ewm_mean(close_values, 15)
+                else:
+                    df['ema9'] = df['close'].ewm(span=9, adjust=False).mean()
+                    df['ema15'] = df['close'].ewm(span=15, adjust=False).mean()
 
-            # 2. Calculate VWAP
-            df['vwap'] = self._calculate_vwap(df)
+                # 2. Calculate VWAP
+                df['vwap'] = self._calculate_vwap(df)
 
-            # 3. Calculate Bollinger Bands
-            df['bb_middle'] = df['close'].rolling(window=20).mean()
-            df['bb_std'] = df['close'].rolling(window=20).std()
-            df['bb_upper'] = df['bb_middle'] + (df['bb_std'] * 2)
-            df['bb_lower'] = df['bb_middle'] - (df['bb_std'] * 2)
-            df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['bb_middle']
+                # 3. Calculate Bollinger Band width
+                df['bb_width'] = self._calculate_bb_width_series(df)
 
-            # 4. Calculate Stochastic
-            df['stoch_k'], df['stoch_d'] = self._calculate_stochastic_full(df)
+                # 4. Calculate Stochastic
+                df['stoch_k'], df['stoch_d'] = self._calculate_stochastic_full(df)
 
-            # 5. Calculate ATR
-            df['atr'] = self._calculate_atr_series(df)
+                # 5. Calculate ATR
+                df['atr'] = self._calculate_atr_series(df)
 
-            # Calculate Heiken Ashi
-            ha_df = self._calculate_heiken_ashi(df)
+                # Calculate Heiken Ashi
+                ha_df = self._calculate_heiken_ashi(df)
+
+                self._save_cached_indicators(indicator_cache_path, indicator_key, df, ha_df)
 
             # Initialize tracking
             trades = []
-            analysis_data = []
 
             # Initial equity
             initial_equity = 10000
@@ -468,26 +676,19 @@ class BacktestEngine:
             best_method = None
             all_method_stats = {}
 
-            # Test different trailing methods
-            trailing_methods = [
-                "Heiken Ashi Candle Trail (1-3 candle lookback)",
-                "EMA Trail (e.g., EMA(9) trailing stop)",
-                "% Price Trail (e.g., 1.5% below current price)",
-                "ATR-Based Trail (1.5x ATR)",
-                "Fixed Tick/Point Trail (custom value)"
-            ]
-
-            method_results = {}
-            for method in trailing_methods:
-                method_results[method] = {
+            # Test different trailing methods, indexed by METHOD_* code (names only for output)
+            method_results = [
+                {
                     "trades": [],
                     "win_count": 0,
                     "loss_count": 0,
                     "total_profit": 0,
                     "total_loss": 0,
                     "max_drawdown": 0,
-                    "equity_curve": [initial_equity]
+                    "final_equity": initial_equity
                 }
+                for _ in range(N_METHODS)
+            ]
 
             # Process ALL candles (start from 0 for complete analysis)
             print(f"[*] Analyzing {len(df)} candles for trade signals...")
@@ -498,254 +699,250 @@ class BacktestEngine:
             # Track active trades
             active_trades = {}
 
+            # Extract columns once as NumPy arrays so the scan works on whole arrays
+            open_a, high_a, low_a, close_a, vol_a = (
+                df[c].to_numpy(dtype=np.float64) for c in ['open', 'high', 'low', 'close', 'volume'])
+            ema9_a, ema15_a, vwap_a, bb_width_a, stoch_k_a, stoch_d_a, atr_a = (
+                df[c].to_numpy(dtype=np.float64) for c in ['ema9', 'ema15', 'vwap', 'bb_width', 'stoch_k', 'stoch_d', 'atr'])
+            ts_a = df['timestamp'].map(str).to_numpy()
+            ha_open_a, ha_high_a, ha_low_a, ha_close_a = (
+                ha_df[c].to_numpy(dtype=np.float64) for c in ['open', 'high', 'low', 'close'])
+
+            n = len(df)
+            candle_idx = np.arange(n)
+            use_mag7 = self.trading_config.get("use_mag7_confirmation", False)
+
+            # Only check for trading signals after warmup period
+            active = (candle_idx >= warmup) & (candle_idx < n - 1)
+
+            # 1. Alignment based on strategy type (+1 bullish, -1 bearish, 0 neutral)
+            if use_mag7:
+                aligned_a, dir_a, align_val_a = self._mag7_alignment_series(sector_data, active)
+            else:
+                aligned_a, dir_a, align_val_a = self._sector_alignment_series(sector_close_mat, sector_order, sector_weights)
+            aligned_a &= active
+
+            # 2. Compression, evaluated only where alignment passed
+            comp_a, comp_dir_a = self._compression_series(df)
+            comp_a &= aligned_a
+            comp_dir_a[~aligned_a] = 0
+            comp_match = aligned_a & comp_a & (comp_dir_a == dir_a)
+
+            # 3. Momentum, then price relative to VWAP and EMA15 (NaN compares False)
+            bullish = dir_a == 1
+            bearish = dir_a == -1
+            mom_ok = (bullish & (stoch_k_a > 20)) | (bearish & (stoch_k_a < 80))
+            trend_ok = ((bullish & (close_a > vwap_a) & (close_a > ema15_a)) |
+                        (bearish & (close_a < vwap_a) & (close_a < ema15_a)))
+            mom_pass = comp_match & mom_ok
+            trend_pass = mom_pass & trend_ok
+
+            # 4. Heiken Ashi entry trigger for every candle at once
+            wick_tolerance = (ha_high_a - ha_low_a) * self._ha_wick_tolerance
+            ha_bull = (np.abs(ha_open_a - ha_low_a) < wick_tolerance) & (ha_close_a > ha_open_a)
+            ha_bear = (np.abs(ha_open_a - ha_high_a) < wick_tolerance) & (ha_close_a < ha_open_a)
+            entry_a = np.where(ha_bull, 1, np.where(ha_bear, -1, 0)).astype(np.int8)
+            entry_mask = trend_pass & (entry_a == dir_a)
+
             # Add some debugging counters
-            alignment_count = 0  # Generic counter for any alignment strategy
-            compression_count = 0
-            momentum_aligned_count = 0
-            trend_aligned_count = 0
-            entry_signal_count = 0
-            trade_count = 0
-
-            # NOW START THE MAIN LOOP - sector_data is already defined
-            # Analyze ALL candles including warmup period
-            for i in range(len(df)):
-                current_time = df.iloc[i]['timestamp'] if 'timestamp' in df.columns else i
-                
-                # Create analysis record for EVERY candle
-                analysis_record = {
-                    'candle_idx': i,
-                    'timestamp': str(current_time),
-                    'open': float(df.iloc[i]['open']),
-                    'high': float(df.iloc[i]['high']),
-                    'low': float(df.iloc[i]['low']),
-                    'close': float(df.iloc[i]['close']),
-                    'volume': float(df.iloc[i]['volume']) if 'volume' in df.columns else 0,
-                    'ema9': float(df.iloc[i]['ema9']) if pd.notna(df.iloc[i]['ema9']) else None,
-                    'ema15': float(df.iloc[i]['ema15']) if pd.notna(df.iloc[i]['ema15']) else None,
-                    'vwap': float(df.iloc[i]['vwap']) if pd.notna(df.iloc[i]['vwap']) else None,
-                    'bb_width': float(df.iloc[i]['bb_width']) if pd.notna(df.iloc[i]['bb_width']) else None,
-                    'stoch_k': float(df.iloc[i]['stoch_k']) if pd.notna(df.iloc[i]['stoch_k']) else None,
-                    'stoch_d': float(df.iloc[i]['stoch_d']) if pd.notna(df.iloc[i]['stoch_d']) else None,
-                    'atr': float(df.iloc[i]['atr']) if pd.notna(df.iloc[i]['atr']) else None,
-                    'sector_aligned': False,
-                    'sector_direction': 'neutral',
-                    'compression_detected': False,
-                    'entry_signal': None,
-                    'trade_entered': False,
-                    'equity': current_equity
-                }
-                
-                # Only check for trading signals after warmup period
-                if i >= warmup and i < len(df) - 1:
-                    # 1. Check alignment based on strategy type
-                    use_mag7 = self.trading_config.get("use_mag7_confirmation", False)
-                    
-                    # Initialize alignment variables
-                    aligned = False
-                    direction = "neutral"
-                    alignment_value = 0
-                    
-                    if use_mag7:
-                        # Check Mag7 alignment
-                        aligned, direction, alignment_value = self._check_mag7_alignment(sector_data, i)
-                        analysis_record['sector_aligned'] = aligned  # Keep field name for compatibility
-                        analysis_record['sector_direction'] = direction
-                        analysis_record['sector_weight'] = alignment_value if aligned else 0
-                        
-                        if aligned:
-                            alignment_count += 1
-                            
-                        
-                        if not aligned:
-                            analysis_record['skip_reason'] = f'No Mag7 alignment (aligned={alignment_value:.1f}%, threshold={self.trading_config.get("mag7_threshold", 60)}%)'
-                    else:
-                        # Check Sector alignment (original ETF-based logic)
-                        aligned, direction, alignment_value = self._check_sector_alignment(sector_data, i, sector_weights)
-                        analysis_record['sector_aligned'] = aligned
-                        analysis_record['sector_direction'] = direction
-                        analysis_record['sector_weight'] = alignment_value if aligned else 0
-                        
-                        if aligned:
-                            alignment_count += 1
-                            print(f"  [✓] Candle {i}: Sector aligned ({direction}, weight={alignment_value}%)")
-                        else:
-                            if i % 100 == 0:  # Log every 100th candle to avoid spam
-                                print(f"  [✗] Candle {i}: No sector alignment")
-                        
-                        if not aligned:
-                            analysis_record['skip_reason'] = f'No sector alignment (weight={alignment_value}%, threshold={self.trading_config.get("sector_weight_threshold", 43)}%)'
-                    
-                    # Continue with common logic for both strategies
-                    if aligned:
-                        # 2. Check for Compression
-                        compression_detected, comp_direction = self._detect_compression(df, i)
-                        analysis_record['compression_detected'] = compression_detected
-                        analysis_record['compression_direction'] = comp_direction if compression_detected else 'neutral'
-                        
-                        if compression_detected:
-                            compression_count += 1
-                        
-                        if not compression_detected or comp_direction != direction:
-                            analysis_record['skip_reason'] = f'No compression or direction mismatch (compression={comp_direction}, {strategy_name.lower()}={direction})'
-                        else:
-                            # 3. Check Momentum
-                            stoch_aligned = False
-                            if direction == "bullish" and df.iloc[i]['stoch_k'] > 20:
-                                stoch_aligned = True
-                            elif direction == "bearish" and df.iloc[i]['stoch_k'] < 80:
-                                stoch_aligned = True
-                            
-                            analysis_record['momentum_aligned'] = stoch_aligned
-                            
-                            if stoch_aligned:
-                                momentum_aligned_count += 1
-                            
-                            if not stoch_aligned:
-                                if direction == "bullish":
-                                    analysis_record['skip_reason'] = f'Momentum not aligned (Stoch K={df.iloc[i]["stoch_k"]:.1f} <= 20)'
-                                else:
-                                    analysis_record['skip_reason'] = f'Momentum not aligned (Stoch K={df.iloc[i]["stoch_k"]:.1f} >= 80)'
-                            else:
-                                # 3b. Price relative to VWAP and EMA15
-                                trend_aligned = False
-                                if pd.notna(df.iloc[i]['vwap']) and pd.notna(df.iloc[i]['ema15']):
-                                    if direction == "bullish" and df.iloc[i]['close'] > df.iloc[i]['vwap'] and df.iloc[i]['close'] > df.iloc[i]['ema15']:
-                                        trend_aligned = True
-                                    elif direction == "bearish" and df.iloc[i]['close'] < df.iloc[i]['vwap'] and df.iloc[i]['close'] < df.iloc[i]['ema15']:
-                                        trend_aligned = True
-                                
-                                analysis_record['trend_aligned'] = trend_aligned
-                                
-                                if trend_aligned:
-                                    trend_aligned_count += 1
-                                
-                                if not trend_aligned:
-                                    if direction == "bullish":
-                                        analysis_record['skip_reason'] = f'Trend not aligned (Price={df.iloc[i]["close"]:.2f} must be > VWAP={df.iloc[i]["vwap"]:.2f} and EMA15={df.iloc[i]["ema15"]:.2f})'
-                                    else:
-                                        analysis_record['skip_reason'] = f'Trend not aligned (Price={df.iloc[i]["close"]:.2f} must be < VWAP={df.iloc[i]["vwap"]:.2f} and EMA15={df.iloc[i]["ema15"]:.2f})'
-                                else:
-                                    # 4. Check Entry Trigger
-                                    if i < len(ha_df):
-                                        entry_signal = self._check_entry_signal(df.iloc[i-1], df.iloc[i], ha_df.iloc[i])
-                                        
-                                        # Debug: Log why entry signal might be None
-                                        if entry_signal is None and i % 100 == 0:  # Log every 100th candle
-                                            ha_candle = ha_df.iloc[i]
-                                            print(f"  [DEBUG] No HA signal at candle {i}: HA_open={ha_candle['open']:.4f}, HA_close={ha_candle['close']:.4f}, HA_low={ha_candle['low']:.4f}, HA_high={ha_candle['high']:.4f}")
-                                        
-                                        analysis_record['entry_signal'] = entry_signal
-                                        
-                                        if entry_signal:
-                                            entry_signal_count += 1
-                                        
-                                        if not entry_signal or entry_signal != direction:
-                                            analysis_record['skip_reason'] = f'No entry signal (HA signal={entry_signal}, expected={direction})'
-                                        else:
-                                            # Valid trade signal found!
-                                            analysis_record['trade_entered'] = True
-                                            analysis_record['trade_direction'] = entry_signal
-                                            trade_count += 1
-                                            
-                                            # Log the trade entry to logger only, not console
-                                            self.logger.info(f"TRADE ENTERED at candle {i}: {direction.upper()} @ ${df.iloc[i]['close']:.2f}")
-                                            
-                                            # Simulate trades for each trailing method
-                                            for method in trailing_methods:
-                                                # Simulate trade with OPTION PRICING
-                                                exit_idx, exit_price, exit_reason = self._simulate_trade_with_method(
-                                                    df, ha_df, i, direction, method
-                                                )
-                                                
-                                                # Calculate option entry price
-                                                entry_stock_price = float(df.iloc[i]['close'])
-                                                option_type = "call" if direction == "bullish" else "put"
-                                                
-                                                # Simple option price approximation (improved from 0.006)
-                                                # ATM option ≈ 1.5% of stock price for weekly options
-                                                entry_option_price = entry_stock_price * 0.015
-                                                strike_price = entry_stock_price  # ATM for simplicity
-                                                delta = 0.60  # Target delta
-                                                
-                                                # Calculate exit option price based on stock movement
-                                                exit_stock_price = float(df.iloc[exit_idx]['close'])
-                                                stock_change = exit_stock_price - entry_stock_price
-                                                
-                                                # Option price change = delta * stock change
-                                                option_price_change = delta * stock_change
-                                                
-                                                if direction == "bullish":
-                                                    exit_option_price = max(entry_option_price + option_price_change, 0.01)
-                                                else:
-                                                    # For puts, price increases when stock goes down
-                                                    exit_option_price = max(entry_option_price - option_price_change, 0.01)
-                                                
-                                                # Calculate OPTION P&L
-                                                contracts = self.trading_config.get("contracts_per_trade", 1)
-                                                option_pnl = (exit_option_price - entry_option_price) * contracts * 100
-                                                option_pnl_pct = ((exit_option_price - entry_option_price) / entry_option_price) * 100
-                                                
-                                                # Create trade record
-                                                trade = {
-                                                    "symbol": symbol,
-                                                    "method": method,
-                                                    "direction": direction,
-                                                    "entry_idx": i,
-                                                    "entry_time": str(df.iloc[i]['timestamp']),
-                                                    "entry_stock_price": entry_stock_price,
-                                                    "entry_option_price": entry_option_price,
-                                                    "strike_price": strike_price,
-                                                    "delta": delta,
-                                                    "exit_idx": exit_idx,
-                                                    "exit_time": str(df.iloc[exit_idx]['timestamp']) if exit_idx < len(df) else str(df.iloc[-1]['timestamp']),
-                                                    "exit_stock_price": exit_stock_price,
-                                                    "exit_option_price": exit_option_price,
-                                                    "exit_reason": exit_reason,
-                                                    "option_pnl": round(option_pnl, 2),
-                                                    "option_pnl_pct": round(option_pnl_pct, 2),
-                                                    "pnl_dollars": round(option_pnl, 2),  # Add this field
-                                                    "pnl_pct": round(option_pnl_pct, 2),  # Add this field
-                                                    "contracts": contracts
-                                                }
-                                                
-                                                # Update method results
-                                                method_results[method]["trades"].append(trade)
-                                                if option_pnl > 0:
-                                                    method_results[method]["win_count"] += 1
-                                                    method_results[method]["total_profit"] += option_pnl
-                                                else:
-                                                    method_results[method]["loss_count"] += 1
-                                                    method_results[method]["total_loss"] += abs(option_pnl)
-                                                
-                                                # Update equity curve
-                                                new_equity = method_results[method]["equity_curve"][-1] + option_pnl
-                                                method_results[method]["equity_curve"].append(new_equity)
-                                            
-                                            # Store the best trade for overall tracking
-                                            best_pnl = -float('inf')
-                                            best_trade = None
-                                            for method in trailing_methods:
-                                                if method_results[method]["trades"]:
-                                                    last_trade = method_results[method]["trades"][-1]
-                                                    if last_trade.get("pnl_dollars", last_trade.get("option_pnl", 0)) > best_pnl:
-                                                        best_pnl = last_trade.get("pnl_dollars", last_trade.get("option_pnl", 0))
-                                                        best_trade = last_trade
-                                            
-                                            if best_trade:
-                                                trades.append(best_trade)
-                                                current_equity += best_trade.get("pnl_dollars", best_trade.get("option_pnl", 0))
+            alignment_count = int(aligned_a.sum())  # Generic counter for any alignment strategy
+            compression_count = int((aligned_a & comp_a).sum())
+            momentum_aligned_count = int(mom_pass.sum())
+            trend_aligned_count = int(trend_pass.sum())
+            entry_signal_count = int((trend_pass & (entry_a != 0)).sum())
+            trade_count = int(entry_mask.sum())
+
+            # P&L of the trade taken at each candle, used to rebuild the equity column
+            best_pnl_a = np.zeros(n, dtype=np.float64)
+
+            # Simulate trades only where every stage of the cascade passed
+            contracts = self._contracts
+            close_list = close_a.tolist()  # Plain floats for the per-trade arithmetic
+            last_idx = n - 1
+            signal_idx = np.flatnonzero(entry_mask)
+            signal_list = signal_idx.tolist()
+            for i in signal_list:
+                # Log the trade entry to logger only, not console
+                self.logger.info(f"TRADE ENTERED at candle {i}: {DIRECTION_NAMES[dir_a[i]].upper()} @ ${close_list[i]:.2f}")
+
+            # Every entry walks its own future window, so all of them are simulated in one parallel call;
+            # the exit rules read the arrays already extracted above, in _exit_series order
+            exit_series = (close_a, atr_a, ha_open_a, ha_close_a, stoch_k_a, stoch_d_a, vwap_a, ema15_a)
+            exit_idx_a, _, exit_reason_a = self._simulate_signals_all_methods(
+                df, ha_df, signal_idx, dir_a[signal_idx], exit_series)
+
+            # Trade fields as (signals, methods) columns; dict records are only built for the results
+            # Simple option price approximation (improved from 0.006)
+            # ATM option ≈ 1.5% of stock price for weekly options
+            entry_stock_a = close_a[signal_idx]
+            entry_option_a = entry_stock_a * 0.015
+            delta = 0.60  # Target delta
+
+            # Calculate exit option price based on stock movement (delta * stock change);
+            # for puts, the price increases when the stock goes down
+            exit_stock_a = close_a[exit_idx_a]
+            option_price_change = delta * (exit_stock_a - entry_stock_a[:, None])
+            exit_option_a = np.maximum(np.where((dir_a[signal_idx] == 1)[:, None],
+                                                entry_option_a[:, None] + option_price_change,
+                                                entry_option_a[:, None] - option_price_change), 0.01)
+
+            # Calculate OPTION P&L
+            option_pnl_a = (exit_option_a - entry_option_a[:, None]) * contracts * 100
+            option_pnl_pct_a = ((exit_option_a - entry_option_a[:, None]) / entry_option_a[:, None]) * 100
+            pnl_rounded = [[round(pnl, 2) for pnl in row] for row in option_pnl_a.tolist()]
+            pnl_pct_rounded = [[round(pct, 2) for pct in row] for row in option_pnl_pct_a.tolist()]
+            exit_time_a = ts_a[np.minimum(exit_idx_a, last_idx)]
+
+            entry_columns = list(zip(signal_list, entry_stock_a.tolist(), entry_option_a.tolist(), ts_a[signal_idx]))
+
+            # Final equity and max drawdown of every method in one fused pass over the P&L, no curves stored
+            method_pnl_rows = np.ascontiguousarray(option_pnl_a.T)
+            final_equity_a, max_dd_a = equity_drawdown(float(initial_equity), method_pnl_rows)
+            if self._store_equity_curve:
+                # One float64 row per method, summed in trade order from the initial equity
+                equity_curves = np.cumsum(np.concatenate(
+                    (np.full((N_METHODS, 1), float(initial_equity)), method_pnl_rows), axis=1), axis=1)
+            for m in range(N_METHODS):
+                results = method_results[m]
+                method_name = METHOD_NAMES[m]
+
+                # Create trade records
+                results["trades"] = [
+                    {
+                        "symbol": symbol,
+                        "method": method_name,
+                        "direction": DIRECTION_NAMES[dir_a[i]],
+                        "entry_idx": i,
+                        "entry_time": entry_time,
+                        "entry_stock_price": entry_stock_price,
+                        "entry_option_price": entry_option_price,
+                        "strike_price": entry_stock_price,  # ATM for simplicity
+                        "delta": delta,
+                        "exit_idx": exit_idx,
+                        "exit_time": exit_time,
+                        "exit_stock_price": exit_stock_price,
+                        "exit_option_price": exit_option_price,
+                        "exit_reason": exit_reason,
+                        "option_pnl": pnl[m],
+                        "option_pnl_pct": pnl_pct[m],
+                        "pnl_dollars": pnl[m],  # Add this field
+                        "pnl_pct": pnl_pct[m],  # Add this field
+                        "contracts": contracts
+                    }
+                    for (i, entry_stock_price, entry_option_price, entry_time), exit_idx, exit_time,
+                        exit_stock_price, exit_option_price, exit_reason, pnl, pnl_pct
+                    in zip(entry_columns, exit_idx_a[:, m].tolist(), exit_time_a[:, m],
+                           exit_stock_a[:, m].tolist(), exit_option_a[:, m].tolist(), exit_reason_a[:, m],
+                           pnl_rounded, pnl_pct_rounded)
+                ]
+
+                # Update method results; cumsum adds in trade order like a running total
+                method_pnl = option_pnl_a[:, m]
+                wins = method_pnl > 0
+                results["win_count"] = int(wins.sum())
+                results["loss_count"] = len(signal_list) - results["win_count"]
+                if results["win_count"]:
+                    results["total_profit"] = float(np.cumsum(np.where(wins, method_pnl, 0.0))[-1])
+                if results["loss_count"]:
+                    results["total_loss"] = float(np.cumsum(np.where(wins, 0.0, np.abs(method_pnl)))[-1])
+
+                # Update equity results (no drawdown is still reported as integer 0)
+                results["final_equity"] = float(final_equity_a[m])
+                results["max_drawdown"] = float(max_dd_a[m]) if max_dd_a[m] > 0 else 0
+                if self._store_equity_curve:
+                    results["equity_curve"] = equity_curves[m]
+
+            # Store the best trade (first method with the highest rounded P&L) for overall tracking
+            if signal_list:
+                best_method = np.argmax(np.array(pnl_rounded), axis=1).tolist()
+                for k, (i, m) in enumerate(zip(signal_list, best_method)):
+                    best_trade = method_results[m]["trades"][k]
+                    trades.append(best_trade)
+                    best_pnl_a[i] = best_trade["pnl_dollars"]
+
+            # Equity before each candle's trade, accumulated trade by trade; it stays the
+            # initial value itself (an int) until the first trade, as the CSV has always shown
+            equity_a = np.cumsum(np.concatenate(([initial_equity], best_pnl_a)))[:n].astype(object)
+            equity_a[:signal_list[0] + 1 if signal_list else n] = initial_equity
+
+            # Per-candle trace of the sector checks and missing HA signals, in candle order;
+            # only formatted when debug logging is on, the totals are printed with the statistics below
+            if self.logger.isEnabledFor(logging.DEBUG):
+                every_100th = candle_idx % 100 == 0
+                no_ha_signal = trend_pass & (entry_a == 0) & every_100th
+                if use_mag7:
+                    log_idx = np.flatnonzero(no_ha_signal)
                 else:
-                    analysis_record['skip_reason'] = 'Warmup period' if i < warmup else 'End of data'
-                                
-                # Add record to analysis data
-                analysis_data.append(analysis_record)
+                    log_idx = np.flatnonzero(aligned_a | (active & ~aligned_a & every_100th) | no_ha_signal)
+                for i in log_idx.tolist():
+                    if not use_mag7:
+                        if aligned_a[i]:
+                            self.logger.debug("Candle %d: Sector aligned (%s, weight=%g%%)",
+                                              i, DIRECTION_NAMES[dir_a[i]], align_val_a[i])
+                        else:
+                            self.logger.debug("Candle %d: No sector alignment", i)
+                    if no_ha_signal[i]:
+                        self.logger.debug("No HA signal at candle %d: HA_open=%.4f, HA_close=%.4f, HA_low=%.4f, HA_high=%.4f",
+                                          i, ha_open_a[i], ha_close_a[i], ha_low_a[i], ha_high_a[i])
+
+            # Per-candle analysis as parallel columns built from the stage arrays
+            direction_labels = np.array(["bearish", "neutral", "bullish"], dtype=object)
+            sector_dir_a = np.where(aligned_a, dir_a, 0)
+
+            # Stage at which each candle left the cascade; text is only built when the CSV is written
+            skip_code = np.select(
+                [~active & (candle_idx < warmup), ~active, ~aligned_a, ~comp_match, ~mom_ok, ~trend_ok, ~entry_mask],
+                [SKIP_WARMUP, SKIP_END_OF_DATA, SKIP_NO_ALIGNMENT, SKIP_NO_COMPRESSION,
+                 SKIP_NO_MOMENTUM, SKIP_NO_TREND, SKIP_NO_ENTRY],
+                SKIP_NONE).astype(np.int8)
+
+            entry_signal_col = np.full(n, None, dtype=object)
+            entry_signal_col[trend_pass & (entry_a != 0)] = direction_labels[entry_a[trend_pass & (entry_a != 0)] + 1]
+
+            analysis_data = {
+                'candle_idx': candle_idx,
+                'timestamp': ts_a,
+                'open': open_a,
+                'high': high_a,
+                'low': low_a,
+                'close': close_a,
+                'volume': vol_a,
+                'ema9': ema9_a,
+                'ema15': ema15_a,
+                'vwap': vwap_a,
+                'bb_width': bb_width_a,
+                'stoch_k': stoch_k_a,
+                'stoch_d': stoch_d_a,
+                'atr': atr_a,
+                'sector_aligned': aligned_a,
+                'sector_direction': direction_labels[sector_dir_a + 1],
+                'compression_detected': aligned_a & comp_a,
+                'entry_signal': entry_signal_col,
+                'trade_entered': entry_mask,
+                'equity': equity_a,
+            }
+
+            # Fields only recorded once the cascade reaches their stage (None elsewhere)
+            staged_fields = [
+                ('sector_weight', active, np.where(aligned_a, align_val_a.astype(object), 0)),
+                ('compression_direction', aligned_a, direction_labels[np.where(comp_a, comp_dir_a, 0) + 1]),
+                ('momentum_aligned', comp_match, mom_ok),
+                ('trend_aligned', mom_pass, trend_ok),
+                ('trade_direction', entry_mask, direction_labels[entry_a + 1]),
+            ]
+            for name, reached, values in staged_fields:
+                if reached.any():
+                    column = np.full(n, None, dtype=object)
+                    column[reached] = values[reached]
+                    analysis_data[name] = column
+            analysis_data['skip_reason'] = skip_code
             
-            print(f"[✓] Analysis complete. Processed {len(analysis_data)} candles.")
+            print(f"[✓] Analysis complete. Processed {n} candles.")
             
             # Print statistics with correct labels
             strategy_type = "Mag7" if use_mag7 else "Sector"
             print(f"\n[*] Signal Statistics:")
-            print(f"  - {strategy_type} Aligned: {alignment_count} times")
+            print(f"  - {strategy_type} Aligned: {alignment_count} times (of {int(active.sum())} candles checked)")
             print(f"  - Compression Detected: {compression_count} times")
             print(f"  - Momentum Aligned: {momentum_aligned_count} times")
             print(f"  - Trend Aligned: {trend_aligned_count} times")
@@ -771,27 +968,31 @@ class BacktestEngine:
                 print(f"  - Volume squeeze threshold: {self.trading_config.get('volume_squeeze_threshold', 0.3)}")
                 
                 # Sample some data to see what's happening
-                if len(analysis_data) > 100:
-                    sample_idx = len(analysis_data) // 2
-                    sample = analysis_data[sample_idx]
+                if n > 100:
+                    sample_idx = n // 2
+                    sample_bb_width = bb_width_a[sample_idx]
                     print(f"\n  Sample candle analysis (idx {sample_idx}):")
-                    print(f"    - Close: {sample.get('close', 'N/A')}")
-                    print(f"    - BB Width: {sample.get('bb_width', 'N/A')}")
-                    print(f"    - Alignment detected: {sample.get('alignment_detected', False)}")
-                    print(f"    - Compression: {sample.get('compression_detected', False)}")
-                    print(f"    - Skip reason: {sample.get('skip_reason', 'N/A')}")
+                    print(f"    - Close: {close_a[sample_idx]}")
+                    print(f"    - BB Width: {None if np.isnan(sample_bb_width) else sample_bb_width}")
+                    print(f"    - Alignment detected: False")
+                    print(f"    - Compression: {analysis_data['compression_detected'][sample_idx]}")
+                    sample = slice(sample_idx, sample_idx + 1)
+                    sample_reason = self._format_skip_reasons(
+                        skip_code[sample], align_val_a[sample], dir_a[sample], comp_dir_a[sample], entry_a[sample],
+                        stoch_k_a[sample], close_a[sample], vwap_a[sample], ema15_a[sample], use_mag7, strategy_name)[0]
+                    print(f"    - Skip reason: {sample_reason or 'N/A'}")
             
             # Determine best trailing method
             best_profit_factor = 0
             best_method = None
             all_method_stats = {}
             
-            for method, results in method_results.items():
+            for method, results in zip(METHOD_NAMES, method_results):
                 if results["win_count"] > 0 or results["loss_count"] > 0:
                     win_rate = (results["win_count"] / (results["win_count"] + results["loss_count"])) * 100
                     profit_factor = results["total_profit"] / max(results["total_loss"], 1)
-                    max_dd = self._calculate_max_drawdown(results["equity_curve"])
-                    final_equity = results["equity_curve"][-1]
+                    max_dd = results["max_drawdown"]
+                    final_equity = results["final_equity"]
                     
                     all_method_stats[method] = {
                         "win_rate": win_rate,
@@ -813,17 +1014,7 @@ class BacktestEngine:
             if not hasattr(self, 'run_id'):
                 self.run_id = self.dir_manager.generate_run_id()
             
-            if not hasattr(self, 'run_logger'):
-                run_log_path = self.dir_manager.get_log_path(self.run_id)
-                self.run_logger = logging.getLogger(f"BacktestEngine_{self.run_id}")
-                self.run_logger.setLevel(logging.INFO)
-                
-                # Add handler if not present
-                if not self.run_logger.handlers:
-                    handler = logging.FileHandler(run_log_path)
-                    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-                    handler.setFormatter(formatter)
-                    self.run_logger.addHandler(handler)
+            self._ensure_run_logger()
             
             # Log the analysis summary
             self.run_logger.info(f"\nBacktest Summary for {symbol}:")
@@ -840,8 +1031,8 @@ class BacktestEngine:
             try:
                 # Ensure we have the directory manager and run_id
                 if not hasattr(self, 'dir_manager'):
-                    from Code.bot_core.backtest_directory_manager import BacktestDirectoryManager
-                    self.dir_manager = BacktestDirectoryManager()
+                    from Code.bot_core.backtest_directory_manager import get_directory_manager
+                    self.dir_manager = get_directory_manager()
                 
                 if not hasattr(self, 'run_id'):
                     self.run_id = self.dir_manager.generate_run_id()
@@ -858,14 +1049,17 @@ class BacktestEngine:
                 os.makedirs(os.path.dirname(analysis_path), exist_ok=True)
                 
                 # Save analysis data
+                analysis_data['skip_reason'] = self._format_skip_reasons(
+                    skip_code, align_val_a, dir_a, comp_dir_a, entry_a,
+                    stoch_k_a, close_a, vwap_a, ema15_a, use_mag7, strategy_name)
                 self._save_analysis_to_csv(analysis_data, analysis_path)
                 
-                print(f"[✓] Saved {strategy_suffix} strategy analysis ({len(analysis_data)} records) to {analysis_path}")
+                print(f"[✓] Saved {strategy_suffix} strategy analysis ({n} records) to {analysis_path}")
                 self.logger.info(f"Saved {strategy_suffix} analysis to {analysis_path}")
                 
                 # Also save to run logger if available
                 if hasattr(self, 'run_logger'):
-                    self.run_logger.info(f"{strategy_suffix.capitalize()} analysis saved: {analysis_path} ({len(analysis_data)} records)")
+                    self.run_logger.info(f"{strategy_suffix.capitalize()} analysis saved: {analysis_path} ({n} records)")
                 
             except Exception as e:
                 print(f"[✗] Error saving analysis data: {str(e)}")
@@ -936,6 +1130,237 @@ class BacktestEngine:
     
     
 
+    def _candles_to_df(self, candles):
+        """
+        Build a typed DataFrame from candle dictionaries, one column at a time
+        
+        Args:
+            candles (list): Candle dictionaries as returned by the candle data client
+            
+        Returns:
+            DataFrame: float64 open/high/low/close/volume and a datetime timestamp,
+                       limited to the fields the candles provide
+        """
+        n = len(candles)
+        first = candles[0] if candles else {}
+        columns = {}
+        
+        # Timestamp (falls back to start_time)
+        ts_key = 'timestamp' if 'timestamp' in first else 'start_time' if 'start_time' in first else None
+        if ts_key:
+            columns['timestamp'] = pd.to_datetime([c.get(ts_key) for c in candles])
+        
+        # Price and volume columns, accepting capitalized keys
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            key = col if col in first else col.capitalize()
+            if key not in first:
+                continue
+            try:
+                values = np.fromiter((c.get(key, np.nan) for c in candles), dtype=np.float64, count=n)
+            except (TypeError, ValueError):
+                # Strings or None in the data: coerce like pd.to_numeric(errors='coerce')
+                values = pd.to_numeric(pd.Series([c.get(key) for c in candles]), errors='coerce').to_numpy(dtype=np.float64)
+            columns[col] = values
+        
+        if 'volume' in columns:
+            columns['volume'][np.isnan(columns['volume'])] = 0
+        
+        return pd.DataFrame(columns)
+
+    def _align_to_candles(self, other_df, candle_times):
+        """
+        Align another symbol's candles to the main candle timestamps, carrying the
+        last known candle forward (as reindex(method='ffill') would)
+        
+        Args:
+            other_df (DataFrame): Candles with a timestamp column
+            candle_times (Series): Timestamps of the main ticker's candles
+            
+        Returns:
+            DataFrame: One row per main candle, in candle order
+        """
+        other_df = other_df.sort_values('timestamp', kind='stable')
+        
+        # Last other candle at or before each main candle; -1 (no candle yet) becomes NaN
+        pos = np.searchsorted(other_df['timestamp'].to_numpy(), candle_times.to_numpy(), side='right') - 1
+        aligned = {'timestamp': candle_times.to_numpy()}
+        for col in other_df.columns:
+            if col != 'timestamp':
+                aligned[col] = pd.api.extensions.take(other_df[col].to_numpy(), pos, allow_fill=True)
+        return pd.DataFrame(aligned)
+    
+    def _format_skip_reasons(self, skip_code, align_val, dir_codes, comp_dir_codes, entry_codes,
+                             stoch_k, close, vwap, ema15, use_mag7, strategy_name):
+        """
+        Turn SKIP_* codes into the skip_reason text written to the analysis CSV
+        
+        Args:
+            skip_code (ndarray): SKIP_* code per candle
+            align_val (ndarray): Sector weight or Mag7 percentage per candle
+            dir_codes, comp_dir_codes, entry_codes (ndarray): Alignment, compression and HA direction codes
+            stoch_k, close, vwap, ema15 (ndarray): Values quoted in the momentum and trend reasons
+            use_mag7 (bool): Whether the Mag7 strategy is active
+            strategy_name (str): Strategy display name
+            
+        Returns:
+            ndarray: Object array of reason strings (None where a trade was entered)
+        """
+        reasons = _SKIP_REASON_TEXT[skip_code]
+        
+        idx = np.flatnonzero(skip_code == SKIP_NO_ALIGNMENT)
+        if use_mag7:
+            mag7_threshold = self.trading_config.get("mag7_threshold", 60)
+            reasons[idx] = [f'No Mag7 alignment (aligned={align_val[i]:.1f}%, threshold={mag7_threshold}%)' for i in idx]
+        else:
+            sector_threshold = self.trading_config.get("sector_weight_threshold", 43)
+            reasons[idx] = [f'No sector alignment (weight={align_val[i]:g}%, threshold={sector_threshold}%)' for i in idx]
+        
+        idx = np.flatnonzero(skip_code == SKIP_NO_COMPRESSION)
+        strategy_label = strategy_name.lower()
+        reasons[idx] = [
+            f'No compression or direction mismatch (compression={DIRECTION_NAMES[comp_dir_codes[i]]}, {strategy_label}={DIRECTION_NAMES[dir_codes[i]]})'
+            for i in idx]
+        
+        idx = np.flatnonzero(skip_code == SKIP_NO_MOMENTUM)
+        reasons[idx] = [
+            f'Momentum not aligned (Stoch K={stoch_k[i]:.1f} <= 20)' if dir_codes[i] == 1 else
+            f'Momentum not aligned (Stoch K={stoch_k[i]:.1f} >= 80)' for i in idx]
+        
+        idx = np.flatnonzero(skip_code == SKIP_NO_TREND)
+        reasons[idx] = [
+            f'Trend not aligned (Price={close[i]:.2f} must be > VWAP={vwap[i]:.2f} and EMA15={ema15[i]:.2f})' if dir_codes[i] == 1 else
+            f'Trend not aligned (Price={close[i]:.2f} must be < VWAP={vwap[i]:.2f} and EMA15={ema15[i]:.2f})' for i in idx]
+        
+        idx = np.flatnonzero(skip_code == SKIP_NO_ENTRY)
+        reasons[idx] = [
+            f'No entry signal (HA signal={DIRECTION_NAMES[entry_codes[i]] if entry_codes[i] else None}, expected={DIRECTION_NAMES[dir_codes[i]]})'
+            for i in idx]
+        
+        return reasons
+
+    def _load_signal_thresholds(self):
+        """
+        Read the thresholds used on every candle or trade from trading_config once,
+        as plain scalars, so the per-candle helpers and compiled kernels never touch the dict
+        """
+        tc = self.trading_config
+        
+        # Compression
+        self._bb_width_threshold = float(tc.get("bb_width_threshold", 0.05))
+        self._donchian_threshold = float(tc.get("donchian_contraction_threshold", 0.6))
+        self._volume_squeeze_threshold = float(tc.get("volume_squeeze_threshold", 0.3))
+        self._compression_count = tc.get("compression_threshold_count", 2)
+        
+        # Mag7 alignment
+        self._mag7_stocks = tc.get("mag7_stocks", ["AAPL", "MSFT", "AMZN", "NVDA", "GOOG", "TSLA", "META"])
+        self._mag7_threshold = float(tc.get("mag7_threshold", 60))
+        self._mag7_price_change_threshold = tc.get("mag7_price_change_threshold", 0.2) / 100  # Convert percentage to decimal
+        
+        # Entry and position sizing
+        self._ha_wick_tolerance = tc.get("ha_wick_tolerance", 0.1)
+        self._contracts = tc.get("contracts_per_trade", 1)
+        
+        # Per-method equity curves are only kept when asked for (e.g. for plotting)
+        self._store_equity_curve = bool(tc.get("store_equity_curve", False))
+        
+        # Exit rules, in simulate_all_methods argument order
+        self._exit_params = (
+            float(tc.get("atr_multiple", 1.5)),
+            float(tc.get("option_trail_percentage", 25.0)),
+            float(tc.get("option_fixed_stop", 0.50)),
+            int(tc.get("min_bars_held", 3)),
+            float(tc.get("ha_exit_min_profit", 10.0)),  # 10% for options
+            float(tc.get("stoch_exit_overbought", 80)),
+            float(tc.get("stoch_exit_oversold", 20)),
+        )
+
+    def _indicator_cache_path(self, symbol, period, start_date, end_date, data_source):
+        """
+        Get the cache file path for a ticker's indicators
+
+        Args:
+            symbol (str): Instrument symbol
+            period (int): Candle period in minutes
+            start_date (str): Start date in ISO format
+            end_date (str): End date in ISO format
+            data_source (str): Data source the candles came from
+
+        Returns:
+            str or None: Path of the cache file under Backtest_Data/Indicator_Cache, or None
+            when pyarrow is not installed
+        """
+        if not _INDICATOR_CACHE_PARQUET:
+            return None
+        
+        from Code.bot_core.backtest_directory_manager import get_directory_manager
+        name = f"{symbol}_{period}m_{start_date}_{end_date}_{data_source}"
+        name = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in name)
+        return os.path.join(get_directory_manager().base_dir, _INDICATOR_CACHE_SUBDIR, name + '.parquet')
+
+    def _indicator_cache_key(self, df):
+        """
+        Fingerprint the candles and indicator settings a cached file must match
+
+        Args:
+            df (DataFrame): Candle data with timestamp and OHLCV columns
+
+        Returns:
+            str: Hex digest identifying this input
+        """
+        digest = hashlib.sha1(_INDICATOR_CACHE_VERSION.encode('utf-8'))
+        cols = [c for c in ['timestamp', 'open', 'high', 'low', 'close', 'volume'] if c in df.columns]
+        digest.update(pd.util.hash_pandas_object(df[cols], index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def _load_cached_indicators(self, path, key, n_rows):
+        """
+        Load cached indicators if they were computed from the same candles
+
+        Args:
+            path (str or None): Cache file path from _indicator_cache_path
+            key (str): Expected fingerprint from _indicator_cache_key
+            n_rows (int): Expected number of candles
+
+        Returns:
+            DataFrame or None: Indicator and ha_* columns, or None on a cache miss
+        """
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            cached = pd.read_parquet(path)
+        except Exception as e:
+            self.logger.warning(f"Could not read indicator cache {path}: {e}")
+            return None
+
+        if cached.attrs.get('indicator_key') != key or len(cached) != n_rows:
+            return None
+        return cached
+
+    def _save_cached_indicators(self, path, key, df, ha_df):
+        """
+        Save computed indicators so repeated runs on the same candles can skip them
+
+        Args:
+            path (str or None): Cache file path from _indicator_cache_path (None skips saving)
+            key (str): Fingerprint from _indicator_cache_key
+            df (DataFrame): Candle data with indicator columns
+            ha_df (DataFrame): Heiken Ashi candles
+        """
+        if path is None:
+            return
+        try:
+            cached = pd.DataFrame({col: df[col].to_numpy() for col in _INDICATOR_COLUMNS})
+            for c in _HA_COLUMNS:
+                cached[f'ha_{c}'] = ha_df[c].to_numpy()
+            cached.attrs['indicator_key'] = key
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            cached.to_parquet(tmp_path, compression='zstd', index=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Could not write indicator cache {path}: {e}")
+
     def _print_config_table(self, strategy_name, use_mag7):
         """Print configuration parameters in a formatted table"""
         all_params = self._get_all_config_params()
@@ -1051,13 +1476,13 @@ class BacktestEngine:
         Save detailed analysis data to CSV with configuration parameters and option-specific data
         
         Args:
-            analysis_data (list): List of analysis records
+            analysis_data (dict): Per-candle analysis columns (equal-length arrays)
             filename (str): Output filename
         """
         print(f"[DEBUG] _save_analysis_to_csv called with filename: {filename}")
-        print(f"[DEBUG] Analysis data length: {len(analysis_data) if analysis_data else 0}")
+        print(f"[DEBUG] Analysis data length: {len(analysis_data['candle_idx']) if analysis_data else 0}")
         
-        if not analysis_data:
+        if not analysis_data or not len(analysis_data['candle_idx']):
             print("[DEBUG] No analysis data to save!")
             return
         
@@ -1112,96 +1537,43 @@ class BacktestEngine:
                     'xly_weight': self.trading_config.get("sector_weights", {}).get("XLY", 11),
                 })
             
-            # Create enhanced analysis records with config parameters and option data
-            enhanced_records = []
-            for i, record in enumerate(analysis_data):
-                if i == 0:  # Debug first record
-                    print(f"[DEBUG] First record keys: {list(record.keys())[:10]}...")
-                    
-                enhanced_record = {}
-                
-                # First add all config parameters
-                for key, value in config_params.items():
-                    enhanced_record[f'config_{key}'] = value
-                
-                # Then add comparison values for key metrics
-                if 'bb_width' in record and record['bb_width'] is not None:
-                    enhanced_record['bb_width_vs_threshold'] = f"{record['bb_width']:.4f} vs {config_params['bb_width_threshold']:.4f}"
-                    enhanced_record['bb_compression'] = 'YES' if record['bb_width'] < config_params['bb_width_threshold'] else 'NO'
-                
-                if 'stoch_k' in record and record['stoch_k'] is not None:
-                    if record.get('sector_direction') == 'bullish' or record.get('compression_direction') == 'bullish':
-                        enhanced_record['stoch_momentum_aligned'] = 'YES' if record['stoch_k'] > 20 else 'NO'
-                        enhanced_record['stoch_k_vs_threshold'] = f"{record['stoch_k']:.1f} vs >20"
-                    elif record.get('sector_direction') == 'bearish' or record.get('compression_direction') == 'bearish':
-                        enhanced_record['stoch_momentum_aligned'] = 'YES' if record['stoch_k'] < 80 else 'NO'
-                        enhanced_record['stoch_k_vs_threshold'] = f"{record['stoch_k']:.1f} vs <80"
-                
-                if 'atr' in record and record['atr'] is not None:
-                    enhanced_record['stop_loss_distance'] = f"{record['atr'] * config_params['atr_multiple']:.2f}" if config_params['stop_loss_method'] == 'ATR Multiple' else f"{config_params['fixed_stop_percentage']}%"
-                
-                # Add alignment specific info
-                if use_mag7:
-                    if 'sector_weight' in record:  # Actually Mag7 percentage
-                        enhanced_record['mag7_alignment'] = f"{record['sector_weight']:.1f}% vs {config_params['mag7_threshold']}%"
-                        enhanced_record['mag7_aligned'] = 'YES' if record.get('sector_aligned', False) else 'NO'
-                else:
-                    if 'sector_weight' in record:
-                        enhanced_record['sector_alignment'] = f"{record['sector_weight']}% vs {config_params['sector_weight_threshold']}%"
-                        enhanced_record['sector_aligned'] = 'YES' if record.get('sector_aligned', False) else 'NO'
-                
-                # Add OPTION-SPECIFIC data for trade entries
-                if record.get('trade_entered', False):
-                    stock_price = float(record.get('close', 100))
-                    direction = record.get('trade_direction', record.get('entry_signal', 'bullish'))
-                    
-                    # Calculate estimated option metrics
-                    # For 0.60 delta options, typical premium is 1.5-2% of stock price
-                    option_type = 'call' if direction == 'bullish' else 'put'
-                    
-                    # Estimate strike price for 0.60 delta
-                    if option_type == 'call':
-                        # 0.60 delta call is slightly OTM
-                        strike_price = stock_price * 1.01  # 1% OTM
-                    else:
-                        # 0.60 delta put is slightly ITM  
-                        strike_price = stock_price * 0.99  # 1% ITM
-                    
-                    # Estimate option price (simplified Black-Scholes approximation)
-                    # For 0.60 delta with 7 DTE, roughly 1.5% of stock price
-                    option_price = stock_price * 0.015
-                    
-                    # Add option-specific fields
-                    enhanced_record['option_type'] = option_type
-                    enhanced_record['estimated_strike'] = round(strike_price, 2)
-                    enhanced_record['estimated_option_price'] = round(option_price, 2)
-                    enhanced_record['estimated_delta'] = 0.60
-                    enhanced_record['contracts'] = config_params['contracts_per_trade']
-                    enhanced_record['option_stop_loss'] = round(option_price * (1 - config_params['option_stop_loss_percentage'] / 100), 2)
-                    enhanced_record['max_option_risk'] = round(option_price * config_params['contracts_per_trade'] * 100, 2)
-                    enhanced_record['breakeven_stock_move'] = round((option_price / stock_price) * 100, 2)
-                
-                # Add all original record fields
-                for key, value in record.items():
-                    # Rename sector fields for Mag7 strategy
-                    if use_mag7 and key == 'sector_aligned':
-                        enhanced_record['mag7_aligned'] = value
-                    elif use_mag7 and key == 'sector_direction':
-                        enhanced_record['mag7_direction'] = value
-                    elif use_mag7 and key == 'sector_weight':
-                        enhanced_record['mag7_percentage'] = value
-                    else:
-                        enhanced_record[key] = value
-                
-                enhanced_records.append(enhanced_record)
-            
-            print(f"[DEBUG] Created {len(enhanced_records)} enhanced records")
+            n = len(analysis_data['candle_idx'])
+            print(f"[DEBUG] First record keys: {list(analysis_data)[:10]}...")
             
-            # Identify all keys in enhanced records
-            all_keys = set()
-            for record in enhanced_records:
-                all_keys.update(record.keys())
+            # Decide the column set over the whole run, then format and write in row blocks
+            bb_width = analysis_data['bb_width']
+            stoch_k = analysis_data['stoch_k']
+            atr = analysis_data['atr']
+            sector_direction = analysis_data['sector_direction']
+            compression_direction = analysis_data.get('compression_direction', np.full(n, None, dtype=object))
+            stoch_bullish = ~np.isnan(stoch_k) & ((sector_direction == 'bullish') | (compression_direction == 'bullish'))
+            stoch_bearish = ~np.isnan(stoch_k) & ~stoch_bullish & ((sector_direction == 'bearish') | (compression_direction == 'bearish'))
+            trade_entered = analysis_data['trade_entered']
+            trade_direction = analysis_data.get('trade_direction', analysis_data['entry_signal'])
             
+            option_columns = ['option_type', 'estimated_strike', 'estimated_option_price', 
+                            'estimated_delta', 'contracts', 'option_stop_loss', 
+                            'max_option_risk', 'breakeven_stock_move']
+            mag7_renames = {'sector_aligned': 'mag7_aligned', 'sector_direction': 'mag7_direction',
+                            'sector_weight': 'mag7_percentage'}
+            
+            # First all config parameters (constant columns), then comparisons, option fields and raw fields
+            all_keys = {f'config_{key}' for key in config_params}
+            if not np.isnan(bb_width).all():
+                all_keys.update(['bb_width_vs_threshold', 'bb_compression'])
+            if (stoch_bullish | stoch_bearish).any():
+                all_keys.update(['stoch_momentum_aligned', 'stoch_k_vs_threshold'])
+            if not np.isnan(atr).all():
+                all_keys.add('stop_loss_distance')
+            # Alignment specific info (the aligned YES/NO flag is replaced by the raw column)
+            if 'sector_weight' in analysis_data:
+                all_keys.add('mag7_alignment' if use_mag7 else 'sector_alignment')
+            if trade_entered.any():
+                all_keys.update(option_columns)
+            # Rename sector fields for Mag7 strategy
+            all_keys.update(mag7_renames.get(key, key) if use_mag7 else key for key in analysis_data)
+            
+            print(f"[DEBUG] Created {n} enhanced records")
             print(f"[DEBUG] Total unique keys: {len(all_keys)}")
             
             # Define column order - config parameters first, then comparisons, then data
@@ -1226,11 +1598,6 @@ class BacktestEngine:
                             'trend_aligned', 'entry_signal', 'trade_entered', 'trade_direction',
                             'skip_reason', 'equity']
             
-            # Option-specific columns
-            option_columns = ['option_type', 'estimated_strike', 'estimated_option_price', 
-                            'estimated_delta', 'contracts', 'option_stop_loss', 
-                            'max_option_risk', 'breakeven_stock_move']
-            
             # Combine all columns in order
             ordered_keys = config_keys + comparison_keys
             for col_list in [core_columns, strategy_columns, signal_columns, option_columns]:
@@ -1243,14 +1610,102 @@ class BacktestEngine:
                 if key not in ordered_keys:
                     ordered_keys.append(key)
             
+            def enhanced_block(lo, hi):
+                """Config, comparison, option and raw columns for rows lo:hi"""
+                rows = hi - lo
+                
+                def staged(mask, values):
+                    """Column holding values where mask is set and None elsewhere"""
+                    column = np.full(rows, None, dtype=object)
+                    column[mask] = values
+                    return column
+                
+                enhanced = {f'config_{key}': value for key, value in config_params.items()}
+                
+                # Comparison values for key metrics
+                if 'bb_compression' in all_keys:
+                    width = bb_width[lo:hi]
+                    has_width = ~np.isnan(width)
+                    bb_threshold = config_params['bb_width_threshold']
+                    enhanced['bb_width_vs_threshold'] = staged(has_width, [f"{w:.4f} vs {bb_threshold:.4f}" for w in width[has_width]])
+                    enhanced['bb_compression'] = staged(has_width, np.where(width[has_width] < bb_threshold, 'YES', 'NO'))
+                
+                if 'stoch_momentum_aligned' in all_keys:
+                    k_vals = stoch_k[lo:hi]
+                    bull = stoch_bullish[lo:hi]
+                    bear = stoch_bearish[lo:hi]
+                    momentum_col = staged(bull, np.where(k_vals[bull] > 20, 'YES', 'NO'))
+                    momentum_col[bear] = np.where(k_vals[bear] < 80, 'YES', 'NO')
+                    vs_col = staged(bull, [f"{k:.1f} vs >20" for k in k_vals[bull]])
+                    vs_col[bear] = [f"{k:.1f} vs <80" for k in k_vals[bear]]
+                    enhanced['stoch_momentum_aligned'] = momentum_col
+                    enhanced['stoch_k_vs_threshold'] = vs_col
+                
+                if 'stop_loss_distance' in all_keys:
+                    atr_vals = atr[lo:hi]
+                    has_atr = ~np.isnan(atr_vals)
+                    if config_params['stop_loss_method'] == 'ATR Multiple':
+                        enhanced['stop_loss_distance'] = staged(has_atr, [f"{a * config_params['atr_multiple']:.2f}" for a in atr_vals[has_atr]])
+                    else:
+                        enhanced['stop_loss_distance'] = staged(has_atr, f"{config_params['fixed_stop_percentage']}%")
+                
+                if 'sector_weight' in analysis_data:
+                    weights = analysis_data['sector_weight'][lo:hi]
+                    has_weight = weights != None  # noqa: E711 - elementwise on an object array
+                    if use_mag7:  # Actually Mag7 percentage
+                        enhanced['mag7_alignment'] = staged(has_weight, [f"{w:.1f}% vs {config_params['mag7_threshold']}%" for w in weights[has_weight]])
+                    else:
+                        enhanced['sector_alignment'] = staged(has_weight, [f"{w:g}% vs {config_params['sector_weight_threshold']}%" for w in weights[has_weight]])
+                
+                # Add OPTION-SPECIFIC data for trade entries
+                if 'option_type' in all_keys:
+                    trade_rows = np.flatnonzero(trade_entered[lo:hi])
+                    option_fields = {key: [] for key in option_columns}
+                    for r in trade_rows:
+                        stock_price = float(analysis_data['close'][lo + r])
+                        direction = trade_direction[lo + r] or 'bullish'
+                        
+                        # Calculate estimated option metrics
+                        # For 0.60 delta options, typical premium is 1.5-2% of stock price
+                        option_type = 'call' if direction == 'bullish' else 'put'
+                        
+                        # Estimate strike price for 0.60 delta
+                        if option_type == 'call':
+                            # 0.60 delta call is slightly OTM
+                            strike_price = stock_price * 1.01  # 1% OTM
+                        else:
+                            # 0.60 delta put is slightly ITM  
+                            strike_price = stock_price * 0.99  # 1% ITM
+                        
+                        # Estimate option price (simplified Black-Scholes approximation)
+                        # For 0.60 delta with 7 DTE, roughly 1.5% of stock price
+                        option_price = stock_price * 0.015
+                        
+                        # Add option-specific fields
+                        option_fields['option_type'].append(option_type)
+                        option_fields['estimated_strike'].append(round(strike_price, 2))
+                        option_fields['estimated_option_price'].append(round(option_price, 2))
+                        option_fields['estimated_delta'].append(0.60)
+                        option_fields['contracts'].append(config_params['contracts_per_trade'])
+                        option_fields['option_stop_loss'].append(round(option_price * (1 - config_params['option_stop_loss_percentage'] / 100), 2))
+                        option_fields['max_option_risk'].append(round(option_price * config_params['contracts_per_trade'] * 100, 2))
+                        option_fields['breakeven_stock_move'].append(round((option_price / stock_price) * 100, 2))
+                    
+                    for key, values in option_fields.items():
+                        enhanced[key] = staged(trade_rows, values)
+                
+                # Add all original fields
+                for key, values in analysis_data.items():
+                    enhanced[mag7_renames.get(key, key) if use_mag7 else key] = values[lo:hi]
+                return enhanced
+            
             print(f"[DEBUG] Writing CSV with {len(ordered_keys)} columns")
             
-            # Write to CSV
-            import csv
-            with open(filename, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=ordered_keys)
-                writer.writeheader()
-                writer.writerows(enhanced_records)
+            # Stream the rows out block by block so only one block is formatted at a time
+            with self._analysis_writer(filename, ordered_keys) as write_rows:
+                for lo in range(0, n, _ANALYSIS_BLOCK_ROWS):
+                    hi = min(lo + _ANALYSIS_BLOCK_ROWS, n)
+                    write_rows(enhanced_block(lo, hi), hi - lo)
                 
             print(f"[DEBUG] Successfully wrote CSV to: {filename}")
             
@@ -1268,6 +1723,28 @@ class BacktestEngine:
             raise
 
             
+    @contextmanager
+    def _analysis_writer(self, filename, columns):
+        """
+        Open an analysis CSV, write its header and yield a callable that appends rows
+        
+        Args:
+            filename (str): Output filename
+            columns (list): Column names in output order
+            
+        Yields:
+            callable: write_rows(block, rows) appending a dict of column arrays (or constants)
+        """
+        with open(filename, 'w', newline='', buffering=_CSV_BUFFER_SIZE) as f:
+            f.write(','.join(columns) + '\r\n')  # Same line ending as csv.writer
+            
+            def write_rows(block, rows):
+                # Format the whole block in memory, then hand it to the file in a single write()
+                f.write(pd.DataFrame(block, index=range(rows), columns=columns).to_csv(
+                    header=False, index=False, lineterminator='\r\n'))
+            
+            yield write_rows
+    
     def _save_trades_to_csv(self, trades, filename):
         """
         Save trade data to CSV with option-specific fields
@@ -1279,8 +1756,6 @@ class BacktestEngine:
         if not trades:
             return
         
-        import csv
-        
         # Define the columns we want in specific order for option trades
         fieldnames = [
             'symbol',
@@ -1302,28 +1777,23 @@ class BacktestEngine:
             'exit_reason'
         ]
         
-        # Process trades to add calculated fields
-        processed_trades = []
-        for trade in trades:
-            processed_trade = trade.copy()
-            
-            # Calculate stock change percentage
-            if 'entry_stock_price' in trade and 'exit_stock_price' in trade:
-                stock_change = ((trade['exit_stock_price'] - trade['entry_stock_price']) / 
-                            trade['entry_stock_price']) * 100
-                processed_trade['stock_change_pct'] = round(stock_change, 2)
-            
-            # Calculate total P&L
-            if 'option_pnl' in trade and 'contracts' in trade:
-                processed_trade['total_pnl'] = trade['option_pnl']  # Already includes contracts
-            
-            processed_trades.append(processed_trade)
+        # Columnar copy of the trades; fields missing from a trade are left empty
+        processed_trades = pd.DataFrame.from_records(trades)
+        
+        # Calculate stock change percentage
+        if 'entry_stock_price' in processed_trades and 'exit_stock_price' in processed_trades:
+            entry_stock_price = processed_trades['entry_stock_price'].to_numpy(dtype=np.float64)
+            stock_change = ((processed_trades['exit_stock_price'].to_numpy(dtype=np.float64) - entry_stock_price) /
+                            entry_stock_price) * 100
+            processed_trades['stock_change_pct'] = [round(change, 2) for change in stock_change.tolist()]
+        
+        # Calculate total P&L
+        if 'option_pnl' in processed_trades and 'contracts' in processed_trades:
+            processed_trades['total_pnl'] = processed_trades['option_pnl']  # Already includes contracts
         
-        # Write to CSV
-        with open(filename, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(processed_trades)
+        # Write to CSV with pandas' C writer, keeping only the option trade columns
+        with open(filename, 'w', newline='', buffering=_CSV_BUFFER_SIZE) as f:
+            processed_trades.reindex(columns=fieldnames).to_csv(f, index=False, lineterminator='\r\n')
         
         self.logger.info(f"Saved {len(processed_trades)} option trades to {filename}")
     
@@ -1356,297 +1826,273 @@ class BacktestEngine:
         Returns:
             DataFrame: Heiken Ashi candles
         """
-        ha = pd.DataFrame(index=data.index)
-        
-        # Calculate Heiken Ashi values
-        ha['open'] = ((data['open'].shift(1) + data['close'].shift(1)) / 2).fillna(data['open'])
-        ha['close'] = (data['open'] + data['high'] + data['low'] + data['close']) / 4
-        ha['high'] = data[['high', 'open', 'close']].max(axis=1)
-        ha['low'] = data[['low', 'open', 'close']].min(axis=1)
+        o, h, l, c = (data[col].to_numpy(dtype=np.float64) for col in ['open', 'high', 'low', 'close'])
+        
+        if NUMBA_AVAILABLE:
+            # Single compiled pass producing all four columns
+            ha_open, ha_close, ha_high, ha_low = heiken_ashi(o, h, l, c)
+            return pd.DataFrame({'open': ha_open, 'close': ha_close, 'high': ha_high, 'low': ha_low},
+                                index=data.index)
+        
+        # Open is the midpoint of the previous candle's body, or this candle's open when unavailable
+        ha_open = o.copy()
+        if len(o) > 1:
+            prev_mid = (o[:-1] + c[:-1]) / 2
+            ha_open[1:] = np.where(np.isnan(prev_mid), o[1:], prev_mid)
+        
+        # Calculate Heiken Ashi values (fmax/fmin skip NaN like DataFrame.max)
+        ha = pd.DataFrame({
+            'open': ha_open,
+            'close': (o + h + l + c) / 4,
+            'high': np.fmax(np.fmax(h, o), c),
+            'low': np.fmin(np.fmin(l, o), c),
+        }, index=data.index)
         
         return ha
     
 
 
-    def _check_sector_alignment(self, sector_data, idx, sector_weights):
+    def _sector_alignment_series(self, sector_close, sectors, sector_weights):
         """
-        Check for sector alignment OR Mag7 alignment based on configuration
+        Check sector alignment for every candle at once
         
         Args:
-            sector_data (dict): Dictionary of sector DataFrames (or Mag7 DataFrames)
-            idx (int): Current index
+            sector_close (ndarray): (candles, sectors) close matrix aligned to the main candles
+            sectors (list): Sector symbol for each column of sector_close
             sector_weights (dict): Sector weights dictionary
             
         Returns:
-            tuple: (aligned, direction, combined_weight)
+            tuple: (aligned, direction, combined_weight) arrays; direction uses DIRECTION_CODES
         """
-        # Check if we should use Mag7 instead
-        if self.trading_config.get("use_mag7_confirmation", False):
-            # For Mag7, pass the Mag7 data directly
-            return self._check_mag7_alignment(sector_data, idx)
-        
-        # Original sector alignment logic
-        if not sector_data:
+        n = sector_close.shape[0]
+        aligned = np.zeros(n, dtype=bool)
+        direction = np.zeros(n, dtype=np.int8)
+        # Integer weights add up to integer totals, so the CSV keeps showing e.g. 57 rather than 57.0
+        weights = [sector_weights.get("XLK", 32)] + [sector_weights.get(s, 0) for s in sectors if s != "XLK"]
+        weight_dtype = np.int64 if all(isinstance(w, int) for w in weights) else np.float64
+        combined_weight = np.zeros(n, dtype=weight_dtype)
+        
+        if not sectors:
             self.logger.warning("No sector data available for alignment check")
-            return False, "neutral", 0
-        
-        # Get threshold from config (user can set to 0% for testing)
-        threshold = self.trading_config.get("sector_weight_threshold", 43)
-        
-        # Get current status for each sector
-        sector_status = {}
-        for sector, df in sector_data.items():
-            if len(df) <= idx or idx < 5:
-                continue
-                
-            # Get current and 5-period average
-            current_price = df.iloc[idx]['close']
-            avg_5 = df.iloc[idx-5:idx]['close'].mean()
-            
-            # Get price change threshold from config
-            price_change_threshold = self.trading_config.get("sector_price_change_threshold", 0.2) / 100
-            
-            # Determine sector status based on current vs average
-            if current_price > avg_5 * (1 + price_change_threshold):
-                sector_status[sector] = "bullish"
-            elif current_price < avg_5 * (1 - price_change_threshold):
-                sector_status[sector] = "bearish"
-        
-        # Check XLK alignment with other sectors
-        xlk_status = sector_status.get("XLK", "neutral")
+            return aligned, direction, combined_weight
         
-        if xlk_status == "neutral":
-            return False, "neutral", 0
+        # XLK leads the alignment, so without it no candle can align
+        if "XLK" not in sectors:
+            return aligned, direction, combined_weight
         
-        # Count aligned sectors
-        aligned_weight = sector_weights.get("XLK", 32)  # XLK weight
-        
-        for sector, status in sector_status.items():
-            if sector != "XLK" and status == xlk_status:
-                aligned_weight += sector_weights.get(sector, 0)
-        
-        # Check if weight exceeds threshold
-        if aligned_weight >= threshold:
-            return True, xlk_status, aligned_weight
-        
-        return False, "neutral", aligned_weight
-
-
+        threshold = self.trading_config.get("sector_weight_threshold", 43)
+        price_change_threshold = self.trading_config.get("sector_price_change_threshold", 0.2) / 100
+        
+        # Per-candle status of each sector: current close vs mean of the previous 5 closes
+        status = np.zeros((n, len(sectors)), dtype=np.int8)
+        for k in range(len(sectors)):
+            status[:, k] = self._price_status_series(sector_close[:, k], price_change_threshold)
+        
+        # XLK leads; other sectors add their weight when they agree with it
+        xlk_status = status[:, sectors.index("XLK")]
+        others = [k for k, sector in enumerate(sectors) if sector != "XLK"]
+        other_weights = np.array([sector_weights.get(sectors[k], 0) for k in others], dtype=weight_dtype)
+        agree = status[:, others] == xlk_status[:, None]
+        
+        xlk_active = xlk_status != 0
+        combined_weight[xlk_active] = sector_weights.get("XLK", 32) + (agree[xlk_active] @ other_weights)
+        aligned[:] = xlk_active & (combined_weight >= threshold)
+        direction[aligned] = xlk_status[aligned]
+        return aligned, direction, combined_weight
 
-    def _check_mag7_alignment(self, market_data, idx):
+    def _price_status_series(self, close, price_change_threshold):
         """
-        Check for Magnificent 7 alignment using historical data
+        Per-candle trend status of one symbol: current close vs mean of the previous 5 closes
         
         Args:
-            market_data (dict): Dictionary of DataFrames (includes Mag7 stocks)
-            idx (int): Current index
+            close (ndarray): Close prices
+            price_change_threshold (float): Fractional move away from the average that counts
             
         Returns:
-            tuple: (aligned, direction, percentage)
+            ndarray: int8 status, 1 above / -1 below the average by the threshold, else 0
         """
-        # Get Mag7 stocks from config
-        mag7_stocks = self.trading_config.get("mag7_stocks", 
-            ["AAPL", "MSFT", "AMZN", "NVDA", "GOOG", "TSLA", "META"])
-        
-        # Get threshold from config
-        threshold = float(self.trading_config.get("mag7_threshold", 60))
-        
-        # Extract Mag7 data from market_data
-        mag7_data = {}
-        for symbol in mag7_stocks:
-            if symbol in market_data:
-                mag7_data[symbol] = market_data[symbol]
-        
-        if not mag7_data or idx < 5:
-            return False, "neutral", 0
-        
-        # Analyze each stock
-        stock_statuses = {}
+        n = close.shape[0]
+        status = np.zeros(n, dtype=np.int8)
+        if n <= 5:
+            return status
+        
+        windows = np.lib.stride_tricks.sliding_window_view(close[:-1], 5)
+        valid = ~np.isnan(windows)
+        with np.errstate(invalid='ignore'):  # all-NaN windows stay NaN, like Series.mean()
+            avg_5 = np.where(valid, windows, 0).sum(axis=1) / valid.sum(axis=1)
+        current = close[5:]
+        status[5:] = np.where(current > avg_5 * (1 + price_change_threshold), 1,
+                              np.where(current < avg_5 * (1 - price_change_threshold), -1, 0))
+        return status
+    
+    def _mag7_alignment_series(self, market_data, active):
+        """
+        Check Mag7 alignment for every candle at once
         
-        for symbol, df in mag7_data.items():
-            if len(df) <= idx:
-                continue
-            
-            # Get current and average price
-            current_price = df.iloc[idx]['close']
-            avg_5 = df.iloc[idx-5:idx]['close'].mean()
-            
-            # Determine status with price change threshold
-            price_change_threshold = self.trading_config.get("mag7_price_change_threshold", 0.2) / 100  # Convert percentage to decimal
+        Args:
+            market_data (dict): Dictionary of DataFrames aligned to the main candles (includes Mag7 stocks)
+            active (ndarray): Boolean mask of candles to check
             
-            if current_price > avg_5 * (1 + price_change_threshold):  # Above average by threshold
-                stock_statuses[symbol] = "bullish"
-            elif current_price < avg_5 * (1 - price_change_threshold):  # Below average by threshold
-                stock_statuses[symbol] = "bearish"
-            else:
-                stock_statuses[symbol] = "neutral"
-        
-        # Count statuses
-        bullish_count = sum(1 for status in stock_statuses.values() if status == "bullish")
-        bearish_count = sum(1 for status in stock_statuses.values() if status == "bearish")
+        Returns:
+            tuple: (aligned, direction, percentage) arrays; direction uses DIRECTION_CODES
+        """
+        n = active.shape[0]
+        aligned = np.zeros(n, dtype=bool)
+        direction = np.zeros(n, dtype=np.int8)
+        percentage = np.zeros(n, dtype=np.float64)
+        
+        # Without data for any configured Mag7 stock no candle can align
+        present = [symbol for symbol in dict.fromkeys(self._mag7_stocks) if symbol in market_data]
+        if not present:
+            return aligned, direction, percentage
+        
+        # Count bullish and bearish stocks per candle
+        bullish_count = np.zeros(n, dtype=np.int64)
+        bearish_count = np.zeros(n, dtype=np.int64)
+        for symbol in present:
+            close = market_data[symbol]['close'].to_numpy(dtype=np.float64)[:n]
+            status = self._price_status_series(close, self._mag7_price_change_threshold)
+            bullish_count[:status.shape[0]] += status == 1
+            bearish_count[:status.shape[0]] += status == -1
         
         # Calculate percentages
-        total_stocks = len(mag7_stocks)
+        total_stocks = len(self._mag7_stocks)
         bullish_pct = (bullish_count / total_stocks) * 100
         bearish_pct = (bearish_count / total_stocks) * 100
         
+        checked = active & (np.arange(n) >= 5)
+        
         # Only log every 100th candle to reduce spam
-        if idx % 100 == 0:
-            self.logger.info(f"Mag7 alignment at candle {idx}: {bullish_count} bullish ({bullish_pct:.1f}%), "
-                            f"{bearish_count} bearish ({bearish_pct:.1f}%)")
+        for idx in np.flatnonzero(checked[::100]) * 100:
+            self.logger.info(f"Mag7 alignment at candle {idx}: {bullish_count[idx]} bullish ({bullish_pct[idx]:.1f}%), "
+                            f"{bearish_count[idx]} bearish ({bearish_pct[idx]:.1f}%)")
         
         # Check alignment
-        if bullish_pct >= threshold:
-            return True, "bullish", bullish_pct
-        elif bearish_pct >= threshold:
-            return True, "bearish", bearish_pct
-        else:
-            return False, "neutral", max(bullish_pct, bearish_pct)
-
-
-    def _detect_compression(self, df, idx):
+        bullish = checked & (bullish_pct >= self._mag7_threshold)
+        bearish = checked & ~bullish & (bearish_pct >= self._mag7_threshold)
+        aligned[:] = bullish | bearish
+        direction[bullish] = 1
+        direction[bearish] = -1
+        percentage[:] = np.where(bullish, bullish_pct,
+                                 np.where(bearish, bearish_pct, np.maximum(bullish_pct, bearish_pct)))
+        percentage[~checked] = 0
+        return aligned, direction, percentage
+    
+    def _compression_windows(self, df):
         """
-        Detect price compression
+        Precompute the rolling windows used by _compression_series for every candle
         
         Args:
             df (DataFrame): Price data with technical indicators
-            idx (int): Current index
             
         Returns:
-            tuple: (compression_detected, direction)
+            dict: dc_range, reference_range, recent_vol, past_vol and has_volume arrays
         """
-        # Need at least 20 candles of data
-        if idx < 20 or idx >= len(df):
-            return False, "neutral"
-            
-        # 1. Bollinger Band Width check
-        if 'bb_width' in df.columns:
-            bb_width = df.iloc[idx]['bb_width']
-        else:
-            bb_width = self._calculate_bollinger_band_width(df.iloc[idx-20:idx+1])
-        
-        # Get threshold from config
-        bb_width_threshold = float(self.trading_config.get("bb_width_threshold", 0.05))
-        bb_compression = pd.notna(bb_width) and bb_width < bb_width_threshold and bb_width > 0
-        
-        # 2. Calculate Donchian Channel contraction
-        high_max = df['high'].iloc[idx-20:idx+1].max()
-        low_min = df['low'].iloc[idx-20:idx+1].min()
-        dc_range = high_max - low_min
-        
-        # Calculate average true range for comparison
-        if idx >= 40:
-            past_high_max = df['high'].iloc[idx-40:idx-20].max()
-            past_low_min = df['low'].iloc[idx-40:idx-20].min()
-            past_range = past_high_max - past_low_min
-            # Get threshold from config
-            dc_threshold = float(self.trading_config.get("donchian_contraction_threshold", 0.6))
-            dc_compression = dc_range < (past_range * dc_threshold)
+        n = len(df)
+        high = df['high']
+        low = df['low']
+        
+        # Donchian range over the last 21 candles and the 20 candles before them
+        dc_range = (high.rolling(21, min_periods=1).max() - low.rolling(21, min_periods=1).min()).to_numpy()
+        reference_range = (high.rolling(20, min_periods=1).max().shift(21)
+                           - low.rolling(20, min_periods=1).min().shift(21)).to_numpy(copy=True)
+        # Too little history for a past window: compare against the average range so far
+        for idx in range(20, min(40, n)):
+            reference_range[idx] = high.iloc[:idx+1].mean() - low.iloc[:idx+1].mean()
+        
+        windows = {'dc_range': dc_range, 'reference_range': reference_range}
+        
+        if 'volume' in df.columns:
+            volume = df['volume']
+            windows['has_volume'] = (volume.rolling(21, min_periods=1).sum() > 0).to_numpy()
+            windows['recent_vol'] = volume.rolling(6, min_periods=1).mean().to_numpy()
+            past_vol = volume.rolling(15, min_periods=1).mean().shift(6).to_numpy(copy=True)
+            for idx in range(20, min(25, n)):
+                past_vol[idx] = volume.iloc[:idx].mean()
+            windows['past_vol'] = past_vol
         else:
-            avg_range = (df['high'].iloc[:idx+1].mean() - df['low'].iloc[:idx+1].mean())
-            dc_threshold = float(self.trading_config.get("donchian_contraction_threshold", 0.6))
-            dc_compression = dc_range < (avg_range * dc_threshold)
-        
-        # Calculate average true range for comparison
-        if idx >= 40:
-            past_high_max = df['high'].iloc[idx-40:idx-20].max()
-            past_low_min = df['low'].iloc[idx-40:idx-20].min()
-            past_range = past_high_max - past_low_min
-            # Get threshold from config
-            dc_threshold = float(self.trading_config.get("donchian_contraction_threshold", 0.6))
-            dc_compression = dc_range < (past_range * dc_threshold)
-        else:
-            avg_range = (df['high'].iloc[:idx+1].mean() - df['low'].iloc[:idx+1].mean())
-            dc_threshold = float(self.trading_config.get("donchian_contraction_threshold", 0.6))
-            dc_compression = dc_range < (avg_range * dc_threshold)
-        
-        # 3. Calculate Volume Squeeze
-        if 'volume' in df.columns and df['volume'].iloc[idx-20:idx+1].sum() > 0:
-            recent_vol = df['volume'].iloc[idx-5:idx+1].mean()
-            past_vol = df['volume'].iloc[idx-20:idx-5].mean() if idx >= 25 else df['volume'].iloc[:idx].mean()
-            # Get threshold from config
-            vol_threshold = float(self.trading_config.get("volume_squeeze_threshold", 0.3))
-            volume_squeeze = recent_vol < (past_vol * vol_threshold) if past_vol > 0 else False
-        else:
-            volume_squeeze = False
-        
-        # Get compression threshold count from config
-        required_compression_count = self.trading_config.get("compression_threshold_count", 2)
-        compression_count = sum([bb_compression, dc_compression, volume_squeeze])
-        compression_detected = compression_count >= required_compression_count
+            windows['has_volume'] = np.zeros(n, dtype=bool)
+        return windows
+    
+    def _compression_series(self, df, windows=None):
+        """
+        Detect price compression for every candle at once
         
-        if not compression_detected:
-            return False, "neutral"
+        Args:
+            df (DataFrame): Price data with technical indicators
+            windows (dict, optional): Output of _compression_windows(df)
             
-        # Determine direction based on VWAP
-        if 'vwap' in df.columns and pd.notna(df.iloc[idx]['vwap']):
-            vwap = df.iloc[idx]['vwap']
-            if df.iloc[idx]['close'] > vwap:
-                return True, "bullish"
-            else:
-                return True, "bearish"
+        Returns:
+            tuple: (compression mask, int8 direction codes with 0 where no compression)
+        """
+        if windows is None:
+            windows = self._compression_windows(df)
+        n = len(df)
+        
+        # 1. Bollinger Band Width check (NaN compares False)
+        if 'bb_width' not in df.columns:
+            df['bb_width'] = self._calculate_bb_width_series(df)
+        bb_width = df['bb_width'].to_numpy(dtype=np.float64)
+        bb_compression = (bb_width < self._bb_width_threshold) & (bb_width > 0)
+        
+        # 2. Donchian Channel contraction
+        dc_compression = windows['dc_range'] < (windows['reference_range'] * self._donchian_threshold)
+        
+        # 3. Volume Squeeze
+        if 'volume' in df.columns:
+            past_vol = windows['past_vol']
+            volume_squeeze = (windows['has_volume'] & (past_vol > 0)
+                              & (windows['recent_vol'] < (past_vol * self._volume_squeeze_threshold)))
         else:
-            # No VWAP, determine direction based on EMA
-            if 'ema15' in df.columns and pd.notna(df.iloc[idx]['ema15']):
-                ema = df.iloc[idx]['ema15']
-                if df.iloc[idx]['close'] > ema:
-                    return True, "bullish"
-                else:
-                    return True, "bearish"
-            else:
-                # Use price action to determine direction
-                if df.iloc[idx]['close'] > df.iloc[idx]['open']:
-                    return True, "bullish"
-                else:
-                    return True, "bearish"
-                
-
-    def _calculate_bollinger_band_width(self, data, window=20, num_std=2):
+            volume_squeeze = np.zeros(n, dtype=bool)
+        
+        compression_count = (bb_compression.astype(np.int8) + dc_compression.astype(np.int8)
+                             + volume_squeeze.astype(np.int8))
+        # Need at least 20 candles of data
+        compression = (compression_count >= self._compression_count) & (np.arange(n) >= 20)
+        
+        # Direction from VWAP, then EMA15, then the candle itself
+        close = df['close'].to_numpy(dtype=np.float64)
+        nan_column = np.full(n, np.nan)
+        vwap = df['vwap'].to_numpy(dtype=np.float64) if 'vwap' in df.columns else nan_column
+        ema = df['ema15'].to_numpy(dtype=np.float64) if 'ema15' in df.columns else nan_column
+        reference = np.where(~np.isnan(vwap), vwap,
+                             np.where(~np.isnan(ema), ema, df['open'].to_numpy(dtype=np.float64)))
+        direction = np.where(close > reference, 1, -1).astype(np.int8)
+        direction[~compression] = 0
+        return compression, direction
+    
+    def _calculate_bb_width_series(self, data, window=20, num_std=2):
         """
-        Calculate Bollinger Band width
+        Calculate Bollinger Band width for every candle in one pass
         
         Args:
-            data (DataFrame): Price data with OHLCV columns
+            data (DataFrame): Price data with a close column
             window (int): Window for moving average
             num_std (int): Number of standard deviations
             
         Returns:
-            float: Bollinger Band width as percentage of middle band
+            Series: (upper band - lower band) / middle band, NaN during warmup
         """
-        try:
-            # Calculate middle band (simple moving average)
-            if len(data) < window:
-                return 0.05  # Default value if not enough data
-                
-            # Make sure we're working with float values
-            if 'close' in data.columns:
-                close_prices = data['close'].astype(float)
-            elif 'Close' in data.columns:
-                close_prices = data['Close'].astype(float)
-            else:
-                # No close prices available
-                return 0.05
-            
-            # Calculate middle band (SMA)
-            middle_band = close_prices.rolling(window=window).mean().iloc[-1]
-            
-            # Calculate standard deviation
-            std = close_prices.rolling(window=window).std().iloc[-1]
-            
-            # Calculate upper and lower bands
-            upper_band = middle_band + (std * num_std)
-            lower_band = middle_band - (std * num_std)
-            
-            # Calculate width as percentage of middle band
-            if middle_band == 0 or pd.isna(middle_band):
-                return 0.05  # Prevent division by zero
-                
-            width = (upper_band - lower_band) / middle_band
-            
-            return width if pd.notna(width) else 0.05
-        except Exception as e:
-            self.logger.error(f"Error calculating Bollinger Band width: {e}")
-            return 0.05  # Default value on error
+        close_prices = data['close'].to_numpy(dtype=np.float64)
+        has_gaps = np.isnan(close_prices).any()
+        # TA-Lib's running sums carry a NaN forward forever; pandas only loses the windows holding it
+        if talib is not None and not has_gaps:
+            middle_band = talib.SMA(close_prices, timeperiod=window)
+            # TA-Lib's STDDEV is the population deviation; rescale to the sample std pandas uses
+            std = talib.STDDEV(close_prices, timeperiod=window, nbdev=1) * np.sqrt(window / (window - 1))
+        elif NUMBA_AVAILABLE and not has_gaps:
+            # Fused kernel: middle band and deviation in the same rolling pass
+            return pd.Series(bollinger_width(close_prices, window, num_std), index=data.index)
+        else:
+            rolling = pd.Series(close_prices).rolling(window=window)
+            middle_band = rolling.mean().to_numpy()
+            std = rolling.std().to_numpy()
+        
+        upper_band = middle_band + (std * num_std)
+        lower_band = middle_band - (std * num_std)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.Series((upper_band - lower_band) / middle_band, index=data.index)
     
     def _calculate_stochastic_full(self, data, k_period=5, d_period=3, smooth=2):
         """
@@ -1661,6 +2107,31 @@ class BacktestEngine:
         Returns:
             tuple: (Series K, Series D)
         """
+        high = data['high'].to_numpy(dtype=np.float64)
+        low = data['low'].to_numpy(dtype=np.float64)
+        close = data['close'].to_numpy(dtype=np.float64)
+        has_gaps = np.isnan(high).any() or np.isnan(low).any() or np.isnan(close).any()
+        
+        # Neither TA-Lib's windows nor the compiled kernels skip a missing price the way
+        # pandas' do, so gaps go through pandas
+        use_talib = talib is not None and len(data) >= k_period + smooth + d_period and not has_gaps
+        if use_talib or (NUMBA_AVAILABLE and not has_gaps):
+            # Same definition as below: raw K over k_period, then two simple moving averages
+            # (the compiled kernels use TA-Lib's running-sum SMA when TA-Lib is not installed)
+            high_high = talib.MAX(high, timeperiod=k_period) if use_talib else rolling_max(high, k_period)
+            low_low = talib.MIN(low, timeperiod=k_period) if use_talib else rolling_min(low, k_period)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                raw_k = 100 * (close - low_low) / (high_high - low_low)
+            raw_k[~np.isfinite(raw_k)] = 50
+            
+            if use_talib:
+                k = talib.SMA(raw_k, timeperiod=smooth)
+                d = talib.SMA(k, timeperiod=d_period)
+            else:
+                k = rolling_mean(raw_k, smooth)
+                d = rolling_mean(k, d_period)
+            return pd.Series(k, index=data.index), pd.Series(d, index=data.index)
+        
         # Calculate highest high and lowest low over k_period
         high_high = data['high'].rolling(window=k_period).max()
         low_low = data['low'].rolling(window=k_period).min()
@@ -1677,55 +2148,6 @@ class BacktestEngine:
         
         return k, d
     
-    def _calculate_stochastic(self, data, k_period=5, d_period=3, smooth=2):
-        """
-        Calculate Stochastic Oscillator for a single position
-        
-        Args:
-            data (DataFrame): Price data
-            k_period (int): K period
-            d_period (int): D period
-            smooth (int): Smoothing factor
-            
-        Returns:
-            tuple: (K value, D value)
-        """
-        # Need enough data for calculation
-        if len(data) < k_period + d_period:
-            return 50, 50
-            
-        # Calculate highest high and lowest low over look back period
-        high_high = data['high'].rolling(window=k_period).max().iloc[-1]
-        low_low = data['low'].rolling(window=k_period).min().iloc[-1]
-        
-        # Calculate raw K
-        close = data['close'].iloc[-1]
-        if high_high == low_low:
-            raw_k = 50
-        else:
-            raw_k = 100 * (close - low_low) / (high_high - low_low)
-            
-        # Simple smoothing for K
-        k_values = []
-        for i in range(min(smooth, len(data))):
-            if i == 0:
-                k_values.append(raw_k)
-            else:
-                prev_close = data['close'].iloc[-(i+1)]
-                prev_high = data['high'].rolling(window=k_period).max().iloc[-(i+1)]
-                prev_low = data['low'].rolling(window=k_period).min().iloc[-(i+1)]
-                
-                if prev_high == prev_low:
-                    k_values.append(50)
-                else:
-                    k_values.append(100 * (prev_close - prev_low) / (prev_high - prev_low))
-        
-        k = sum(k_values) / len(k_values)
-        
-        # For D, we'd need to calculate K for past d_period points
-        # For simplicity, just return k as both values
-        return k, k
-    
     def _calculate_atr_series(self, data, period=14):
         """
         Calculate ATR for entire DataFrame
@@ -1737,43 +2159,22 @@ class BacktestEngine:
         Returns:
             Series: ATR values
         """
-        # Calculate True Range components
-        tr1 = data['high'] - data['low']
-        tr2 = abs(data['high'] - data['close'].shift(1))
-        tr3 = abs(data['low'] - data['close'].shift(1))
-        
-        # True Range is the maximum of the three
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        
-        # Calculate ATR as average of True Range
-        atr = tr.rolling(window=period).mean()
-        
-        return atr
-    
-    def _calculate_atr(self, data, idx=None, period=14):
-        """
-        Calculate ATR for a specific index
-        
-        Args:
-            data (DataFrame): Price data
-            idx (int, optional): Index to calculate for
-            period (int): ATR period
-            
-        Returns:
-            float: ATR value
-        """
-        try:
-            # Calculate full ATR series
-            atr_series = self._calculate_atr_series(data, period)
-            
-            # Return ATR for specific index or last value
-            if idx is not None and idx < len(atr_series):
-                return atr_series.iloc[idx] if not pd.isna(atr_series.iloc[idx]) else 1.0
-            else:
-                return atr_series.iloc[-1] if not pd.isna(atr_series.iloc[-1]) else 1.0
-        except Exception as e:
-            self.logger.error(f"Error calculating ATR: {e}")
-            return 1.0  # Default value
+        high = data['high'].to_numpy(dtype=np.float64)
+        low = data['low'].to_numpy(dtype=np.float64)
+        prev_close = np.concatenate(([np.nan], data['close'].to_numpy(dtype=np.float64)[:-1]))
+        
+        # True Range is the maximum of the three components; fmax skips NaN, so the
+        # first candle keeps its high-low range
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        
+        # Calculate ATR as a simple (not Wilder) average of True Range; TA-Lib's and the
+        # compiled running sums would carry a missing range forward forever, so gaps go through pandas
+        has_gaps = np.isnan(tr).any()
+        if talib is not None and len(data) >= period and not has_gaps:
+            return pd.Series(talib.SMA(tr, timeperiod=period), index=data.index)
+        if NUMBA_AVAILABLE and not has_gaps:
+            return pd.Series(rolling_mean(tr, period), index=data.index)
+        return pd.Series(tr, index=data.index).rolling(window=period).mean()
     
     def _calculate_vwap(self, data):
         """
@@ -1786,17 +2187,21 @@ class BacktestEngine:
             Series: VWAP values
         """
         # Calculate typical price
-        typical_price = (data['high'] + data['low'] + data['close']) / 3
+        typical_price = (data['high'].to_numpy(dtype=np.float64) + data['low'].to_numpy(dtype=np.float64)
+                         + data['close'].to_numpy(dtype=np.float64)) / 3
         
         # If volume column exists
-        if 'volume' in data.columns and data['volume'].sum() > 0:
-            # Calculate VWAP
-            vwap = (typical_price * data['volume']).cumsum() / data['volume'].cumsum()
-        else:
-            # No volume data, use simple moving average instead
-            vwap = typical_price.rolling(window=20).mean()
-        
-        return vwap
+        volume = data['volume'].to_numpy(dtype=np.float64) if 'volume' in data.columns else None
+        if volume is not None and np.nansum(volume) > 0:
+            # Calculate VWAP as running sums; NaN candles stay NaN and are skipped like Series.cumsum
+            pv = typical_price * volume
+            with np.errstate(divide='ignore', invalid='ignore'):
+                vwap = np.nancumsum(pv) / np.nancumsum(volume)
+            vwap[np.isnan(pv) | np.isnan(volume)] = np.nan
+            return pd.Series(vwap, index=data.index)
+        
+        # No volume data, use simple moving average instead
+        return pd.Series(typical_price, index=data.index).rolling(window=20).mean()
     
     def _check_entry_signal(self, prev_candle, current_candle, ha_candle):
         """
@@ -1811,15 +2216,11 @@ class BacktestEngine:
             str: "bullish", "bearish", or None for no signal
         """
         try:
-            # Check for Heiken Ashi pattern
-            ha_open = float(ha_candle["open"])
-            ha_close = float(ha_candle["close"])
-            ha_high = float(ha_candle["high"])
-            ha_low = float(ha_candle["low"])
+            # Check for Heiken Ashi pattern (HA candles are already float64)
+            ha_open, ha_close, ha_high, ha_low = ha_candle["open"], ha_candle["close"], ha_candle["high"], ha_candle["low"]
             
-            # Get wick tolerance from config
-            wick_tolerance_pct = self.trading_config.get("ha_wick_tolerance", 0.1)
-            wick_tolerance = (ha_high - ha_low) * wick_tolerance_pct
+            # Wick tolerance from config, read once per run by _load_signal_thresholds
+            wick_tolerance = (ha_high - ha_low) * self._ha_wick_tolerance
             
             # Bullish signal - Small or no lower wick = strong bullish candle
             if abs(ha_open - ha_low) < wick_tolerance and ha_close > ha_open:
@@ -1833,47 +2234,27 @@ class BacktestEngine:
         
         return None
     
-    def _check_volume_spike(self, data, idx, lookback=5, threshold=1.5):
-        """
-        Check for volume spike
-        
-        Args:
-            data (DataFrame): Price data
-            idx (int): Current index
-            lookback (int): Number of periods to look back
-            threshold (float): Volume spike threshold
-            
-        Returns:
-            bool: True if volume spike detected
-        """
-        if 'volume' not in data.columns or idx < lookback:
-            return False
-            
-        current_volume = data['volume'].iloc[idx]
-        avg_volume = data['volume'].iloc[idx-lookback:idx].mean()
-        
-        return current_volume > (avg_volume * threshold)
-    
-    
-    def _simulate_trade_with_method(self, data, ha_data, start_idx, direction, method):
+    def _simulate_trade_all_methods(self, data, ha_data, start_idx, direction, series=None):
         """
-        Simulate a trade with a given trailing stop method using OPTION pricing
+        Simulate a trade for every trailing stop method in a single forward pass using OPTION pricing
         
         Args:
             data (DataFrame): Price data
             ha_data (DataFrame): Heiken Ashi data
             start_idx (int): Starting index for the trade
             direction (str): "bullish" or "bearish"
-            method (str): Trailing stop method
+            series (tuple, optional): Arrays from _exit_series, when the caller already extracted them
             
         Returns:
-            tuple: (exit_index, exit_price, reason)
+            list: (exit_index, exit_price, reason) tuples indexed by METHOD_* code
         """
         try:
-            max_bars = min(30, len(data) - start_idx)  # Maximum 30 bars or until end of data
+            # Series used by the exit rules, extracted once as float64 arrays
+            if series is None:
+                series = self._exit_series(data, ha_data)
             
             # Get entry stock price
-            entry_stock_price = float(data.iloc[start_idx]['close'])
+            entry_stock_price = float(series[0][start_idx])
             
             # Calculate initial option price using delta-based model
             # For 0.60 delta options as specified in documentation
@@ -1906,309 +2287,151 @@ class BacktestEngine:
                             f"Option=${entry_option_price:.2f}, "
                             f"Delta={delta:.2f}")
             
-            # Set initial stop price based on method
-            stop_price = None
-            reason = "Max bars reached"
-            
-            if "Heiken Ashi" in method:
-                # For options, use a percentage-based stop initially
-                stop_price = entry_option_price * 0.7  # 30% stop loss
-                
-            elif "EMA" in method:
-                # EMA-based stop for options
-                stop_price = entry_option_price * 0.7  # Start with 30% stop
-                
-            elif "ATR" in method:
-                # ATR-based stop adapted for options
-                if 'atr' in data.columns:
-                    stock_atr = float(data.iloc[start_idx]['atr'])
-                else:
-                    stock_atr = self._calculate_atr(data.iloc[:start_idx+1])
-                
-                # Convert stock ATR to option ATR using delta
-                option_atr = stock_atr * delta
-                atr_multiple = self.trading_config.get("atr_multiple", 1.5)
-                stop_price = entry_option_price - (option_atr * atr_multiple)
-                stop_price = max(stop_price, entry_option_price * 0.5)  # At least 50% stop
-                
-            elif "% Price" in method:
-                # Percentage-based trailing stop for options
-                trail_pct = self.trading_config.get("option_trail_percentage", 25.0)
-                stop_price = entry_option_price * (1 - trail_pct / 100)
-                
-            else:  # Fixed Tick/Point
-                # Fixed dollar stop for options
-                stop_amount = self.trading_config.get("option_fixed_stop", 0.50)
-                stop_price = entry_option_price - stop_amount
-                stop_price = max(stop_price, 0.05)  # Minimum 5 cents
-            
-            # Track maximum option price for trailing stops
-            max_option_price = entry_option_price
-            
-            # Minimum holding period
-            min_holding_bars = self.trading_config.get("min_bars_held", 3)
-            
-            # Simulate the trade bar by bar
-            for i in range(start_idx + 1, min(start_idx + max_bars, len(data))):
-                # Calculate bars held
-                bars_held = i - start_idx
-                
-                # Skip exit checks if minimum holding period not met
-                if bars_held < min_holding_bars:
-                    continue
-                    
-                if i >= len(data):
-                    break
-                
-                # Get current stock price
-                current_stock_price = float(data.iloc[i]['close'])
-                
-                # Calculate stock price change
-                stock_change = current_stock_price - entry_stock_price
-                stock_change_pct = (stock_change / entry_stock_price) * 100
-                
-                # Simulate option price movement using delta
-                # Option price change = Stock price change × Delta
-                option_price_change = stock_change * delta
-                
-                # Add gamma effect (delta changes as stock moves)
-                # Approximate gamma as 0.02 for near-the-money options
-                gamma = 0.02
-                gamma_adjustment = 0.5 * gamma * (stock_change ** 2)
-                
-                # Calculate current option price
-                if option_type == "call":
-                    current_option_price = entry_option_price + option_price_change + gamma_adjustment
-                else:  # put
-                    # Puts move opposite to stock
-                    current_option_price = entry_option_price - option_price_change + gamma_adjustment
-                
-                # Add time decay (theta)
-                # Approximate daily theta as 2% of option value for 7 DTE
-                theta_decay = entry_option_price * 0.02 * (bars_held / 78)  # 78 bars per day for 5m
-                current_option_price -= theta_decay
-                
-                # Option price cannot be negative
-                current_option_price = max(current_option_price, 0.01)
-                
-                # Check for stop hit
-                if current_option_price <= stop_price:
-                    return i, stop_price, "Stop loss hit"
-                
-                # Update maximum price and trail stop if applicable
-                if current_option_price > max_option_price:
-                    max_option_price = current_option_price
-                    
-                    # Update trailing stop based on method
-                    if "Heiken Ashi" in method:
-                        # Trail stop to prior bar low for longs
-                        if direction == "bullish" and i > start_idx + 1:
-                            # Use percentage trail for options
-                            new_stop = max_option_price * 0.75  # Trail at 25% below high
-                            stop_price = max(stop_price, new_stop)
-                        elif direction == "bearish" and i > start_idx + 1:
-                            new_stop = max_option_price * 0.75
-                            stop_price = max(stop_price, new_stop)
-                            
-                    elif "EMA" in method:
-                        # Trail based on EMA but for options
-                        new_stop = max_option_price * 0.8  # 20% trail
-                        stop_price = max(stop_price, new_stop)
-                        
-                    elif "ATR" in method:
-                        # Update ATR-based stop
-                        if 'atr' in data.columns:
-                            current_stock_atr = float(data.iloc[i]['atr'])
-                        else:
-                            current_stock_atr = self._calculate_atr(data.iloc[:i+1])
-                        
-                        option_atr = current_stock_atr * delta
-                        new_stop = max_option_price - (option_atr * 1.5)
-                        stop_price = max(stop_price, new_stop)
-                        
-                    elif "% Price" in method:
-                        # Percentage-based trail
-                        trail_pct = 0.25  # 25% trail for options
-                        new_stop = max_option_price * (1 - trail_pct)
-                        stop_price = max(stop_price, new_stop)
-                        
-                    else:  # Fixed Tick
-                        # Fixed amount trail
-                        trail_amount = 0.50  # 50 cents
-                        new_stop = max_option_price - trail_amount
-                        stop_price = max(stop_price, new_stop)
-                
-                # Calculate current profit percentage on the OPTION
-                current_option_pnl_pct = ((current_option_price - entry_option_price) / entry_option_price) * 100
-                
-                # Check for Heiken Ashi reversal signal
-                if i < len(ha_data):
-                    ha_open = float(ha_data.iloc[i]["open"])
-                    ha_close = float(ha_data.iloc[i]["close"])
-                    ha_high = float(ha_data.iloc[i]["high"])
-                    ha_low = float(ha_data.iloc[i]["low"])
-                    
-                    # Get minimum profit threshold for HA exit
-                    min_profit_before_exit = self.trading_config.get("ha_exit_min_profit", 10.0)  # 10% for options
-                    
-                    # Check for reversal
-                    if direction == "bullish" and ha_open > ha_close:
-                        # Bearish reversal - check if we should exit
-                        if current_option_pnl_pct >= min_profit_before_exit:
-                            return i, current_option_price, "Heiken Ashi reversal with profit"
-                        elif current_option_pnl_pct < -10:  # Cut losses if down 10%
-                            return i, current_option_price, "Heiken Ashi reversal - cut loss"
-                            
-                    elif direction == "bearish" and ha_open < ha_close:
-                        # Bullish reversal
-                        if current_option_pnl_pct >= min_profit_before_exit:
-                            return i, current_option_price, "Heiken Ashi reversal with profit"
-                        elif current_option_pnl_pct < -10:
-                            return i, current_option_price, "Heiken Ashi reversal - cut loss"
-                
-                # Check for opposing Stochastic crossover
-                if 'stoch_k' in data.columns and 'stoch_d' in data.columns:
-                    k = data.iloc[i]['stoch_k']
-                    d = data.iloc[i]['stoch_d']
-                    prev_k = data.iloc[i-1]['stoch_k'] if i > start_idx + 1 else k
-                    prev_d = data.iloc[i-1]['stoch_d'] if i > start_idx + 1 else d
-                    
-                    # Get exit thresholds
-                    stoch_exit_overbought = self.trading_config.get("stoch_exit_overbought", 80)
-                    stoch_exit_oversold = self.trading_config.get("stoch_exit_oversold", 20)
-                    
-                    # Exit on stochastic extremes with crossover
-                    if direction == "bullish" and k > stoch_exit_overbought and prev_k > prev_d and k < d:
-                        if current_option_pnl_pct > 0:  # Only exit if profitable
-                            return i, current_option_price, "Stochastic overbought and crossing down"
-                    elif direction == "bearish" and k < stoch_exit_oversold and prev_k < prev_d and k > d:
-                        if current_option_pnl_pct > 0:
-                            return i, current_option_price, "Stochastic oversold and crossing up"
-                
-                # Check for VWAP or EMA crossover against trade
-                if 'vwap' in data.columns and 'ema15' in data.columns:
-                    vwap = data.iloc[i]['vwap']
-                    ema = data.iloc[i]['ema15']
-                    
-                    if pd.notna(vwap) and pd.notna(ema):
-                        if direction == "bullish" and current_stock_price < min(vwap, ema):
-                            # Stock crossed below VWAP and EMA
-                            if current_option_pnl_pct > -5:  # Exit if not too deep in loss
-                                return i, current_option_price, "Price crossed below VWAP and EMA"
-                        elif direction == "bearish" and current_stock_price > max(vwap, ema):
-                            if current_option_pnl_pct > -5:
-                                return i, current_option_price, "Price crossed above VWAP and EMA"
-            
-            # If we reach max bars, exit at current price
-            if start_idx + max_bars < len(data):
-                final_stock_price = float(data.iloc[start_idx + max_bars - 1]['close'])
-                
-                # Calculate final option price
-                final_stock_change = final_stock_price - entry_stock_price
-                final_option_change = final_stock_change * delta
-                gamma_final = 0.5 * gamma * (final_stock_change ** 2)
-                
-                if option_type == "call":
-                    final_option_price = entry_option_price + final_option_change + gamma_final
-                else:
-                    final_option_price = entry_option_price - final_option_change + gamma_final
-                
-                # Apply time decay
-                theta_total = entry_option_price * 0.02 * (max_bars / 78)
-                final_option_price -= theta_total
-                final_option_price = max(final_option_price, 0.01)
-                
-                return start_idx + max_bars - 1, final_option_price, reason
-            else:
-                # End of data reached
-                final_stock_price = float(data.iloc[-1]['close'])
-                final_stock_change = final_stock_price - entry_stock_price
-                final_option_change = final_stock_change * delta
-                gamma_final = 0.5 * gamma * (final_stock_change ** 2)
-                
-                if option_type == "call":
-                    final_option_price = entry_option_price + final_option_change + gamma_final
-                else:
-                    final_option_price = entry_option_price - final_option_change + gamma_final
-                
-                bars_to_end = len(data) - start_idx - 1
-                theta_total = entry_option_price * 0.02 * (bars_to_end / 78)
-                final_option_price -= theta_total
-                final_option_price = max(final_option_price, 0.01)
-                
-                return len(data) - 1, final_option_price, reason
+            exit_idx, exit_price, reason_code = simulate_all_methods(
+                *series, start_idx, DIRECTION_CODES[direction], entry_option_price,
+                *self._exit_params
+            )
+            return [(int(exit_idx[m]), float(exit_price[m]), EXIT_REASONS[reason_code[m]])
+                    for m in range(N_METHODS)]
                 
         except Exception as e:
-            self.logger.error(f"Error simulating trade: {e}")
+            self.logger.error("Error simulating trade: %s", e)
             import traceback
             traceback.print_exc()
             # Return a loss scenario on error
-            return start_idx + 1, entry_option_price * 0.5, f"Error: {str(e)}"
+            return [(start_idx + 1, entry_option_price * 0.5, f"Error: {str(e)}")] * N_METHODS
     
-
+    def _exit_series(self, data, ha_data):
+        """
+        Per-candle series used by the exit rules, in simulator argument order
+        
+        Args:
+            data (DataFrame): Price data
+            ha_data (DataFrame): Heiken Ashi data
             
-    def _calculate_max_drawdown(self, equity_curve):
+        Returns:
+            tuple: close, atr, ha_open, ha_close, stoch_k, stoch_d, vwap, ema15 float64 arrays
         """
-        Calculate maximum drawdown from equity curve
+        # Missing indicators never trigger an exit
+        def column(frame, name):
+            if name in frame.columns:
+                return frame[name].to_numpy(dtype=np.float64)
+            return np.full(len(frame), np.nan)
+        
+        if 'atr' in data.columns:
+            atr = data['atr'].to_numpy(dtype=np.float64)
+        else:
+            atr = self._calculate_atr_series(data).fillna(1.0).to_numpy(dtype=np.float64)
+        
+        return (data['close'].to_numpy(dtype=np.float64), atr,
+                column(ha_data, 'open'), column(ha_data, 'close'),
+                column(data, 'stoch_k'), column(data, 'stoch_d'),
+                column(data, 'vwap'), column(data, 'ema15'))
+    
+    def _simulate_signals_all_methods(self, data, ha_data, signal_idx, dir_codes, series=None):
+        """
+        Simulate every trailing stop method for a batch of entries, spread over all cores
         
         Args:
-            equity_curve (list): Equity curve values
+            data (DataFrame): Price data
+            ha_data (DataFrame): Heiken Ashi data
+            signal_idx (ndarray): Entry candle index of each trade
+            dir_codes (ndarray): DIRECTION_CODES value of each trade
+            series (tuple, optional): Arrays from _exit_series, when the caller already extracted them
             
         Returns:
-            float: Maximum drawdown as percentage
+            tuple: (exit_index, exit_price, reason) arrays of shape (trades, N_METHODS)
         """
-        max_dd = 0
-        peak = equity_curve[0]
+        if len(signal_idx) == 0:
+            return (np.empty((0, N_METHODS), dtype=np.int64), np.empty((0, N_METHODS), dtype=np.float64),
+                    np.empty((0, N_METHODS), dtype=object))
         
-        for equity in equity_curve:
-            if equity > peak:
-                peak = equity
-            else:
-                dd = (peak - equity) / peak * 100
-                max_dd = max(max_dd, dd)
-                
-        return max_dd
+        try:
+            if series is None:
+                series = self._exit_series(data, ha_data)
+            signal_idx = np.asarray(signal_idx, dtype=np.int64)
+            dir_codes = np.asarray(dir_codes, dtype=np.int64)
+            
+            # Same 0.60 delta premium model as _simulate_trade_all_methods, for every entry at once
+            entry_stock_prices = series[0][signal_idx]
+            entry_option_prices = np.maximum(entry_stock_prices * 0.25 * (7 / 365) ** 0.5 * 0.4 * 0.8, 0.10)
+            strike_prices = np.where(dir_codes == 1, entry_stock_prices * 1.01, entry_stock_prices * 0.99)
+            
+            for stock, strike, option in zip(entry_stock_prices.tolist(), strike_prices.tolist(),
+                                             entry_option_prices.tolist()):
+                self.logger.info(f"Option entry: Stock=${stock:.2f}, "
+                                f"Strike=${strike:.2f}, "
+                                f"Option=${option:.2f}, "
+                                f"Delta={0.60:.2f}")
+            
+            exit_idx, exit_price, reason_code = simulate_all_signals(
+                *series, signal_idx, dir_codes, entry_option_prices, *self._exit_params
+            )
+            return exit_idx, exit_price, _EXIT_REASON_TEXT[reason_code]
+            
+        except Exception as e:
+            self.logger.error("Error simulating trades in batch, falling back to one at a time: %s", e)
+            # Reuse the extracted arrays, if that step succeeded, instead of re-reading the frames per trade
+            method_exits = [self._simulate_trade_all_methods(data, ha_data, int(i), DIRECTION_NAMES[int(d)], series)
+                            for i, d in zip(signal_idx, dir_codes)]
+            exit_idx = np.array([[exit[0] for exit in exits] for exits in method_exits], dtype=np.int64)
+            exit_price = np.array([[exit[1] for exit in exits] for exits in method_exits], dtype=np.float64)
+            reasons = np.empty(exit_idx.shape, dtype=object)
+            reasons[:] = [[exit[2] for exit in exits] for exits in method_exits]
+            return exit_idx, exit_price, reasons
+    
 
-    def generate_summary_output(self, results, output_file):
+            
+    def generate_summary_output(self, results, output_file, chunk_size=None):
         """
         Generate summary output file with option trading results
+        
+        Args:
+            results (dict): Result metrics keyed by symbol_period
+            output_file (str): Path of the summary CSV
+            chunk_size (int, optional): Rows built and written per batch; defaults to
+                max(1000, len(results) // 64) so memory stays bounded on large sweeps
         """
-        with open(output_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-            
-            # Updated header row for options
-            writer.writerow([
-                'Symbol_Period', 
-                'Win Rate', 
-                'Profit Factor', 
-                'Max Drawdown', 
-                'Total Trades',
-                'Winning Trades',
-                'Losing Trades',
-                'Gross Profit ($)',
-                'Gross Loss ($)',
-                'Avg Win ($)',
-                'Avg Loss ($)',
-                'Final Equity',
-                'ROI %',
-                'Avg Option Price',
-                'Optimal Trailing Method'
-            ])
-            
-            # Write results for each ticker/period
-            for symbol_period, result in results.items():
+        if chunk_size is None:
+            chunk_size = max(1000, len(results) // 64)
+        
+        # Updated header row for options
+        header = [
+            'Symbol_Period', 
+            'Win Rate', 
+            'Profit Factor', 
+            'Max Drawdown', 
+            'Total Trades',
+            'Winning Trades',
+            'Losing Trades',
+            'Gross Profit ($)',
+            'Gross Loss ($)',
+            'Avg Win ($)',
+            'Avg Loss ($)',
+            'Final Equity',
+            'ROI %',
+            'Avg Option Price',
+            'Optimal Trailing Method'
+        ]
+        
+        with open(output_file, 'w', newline='', buffering=_CSV_BUFFER_SIZE) as f:
+            f.write(','.join(header) + '\r\n')  # Same line ending as csv.writer
+            
+            def summary_row(symbol_period, result):
+                """Build one ticker/period row of the summary"""
+                # Fill in defaults once, then pull every field out in a single C-level call
+                (win_rate, profit_factor, max_drawdown_pct, total_trades, winning_trades, losing_trades,
+                 gross_profit, gross_loss, final_equity, trades, trailing_method) = _summary_fields(
+                    {**_SUMMARY_DEFAULTS, **result})
+                
                 # Calculate additional metrics
-                avg_win = (result.get('Gross Profit', 0) / result.get('Winning Trades', 1) 
-                        if result.get('Winning Trades', 0) > 0 else 0)
-                avg_loss = (result.get('Gross Loss', 0) / result.get('Losing Trades', 1) 
-                        if result.get('Losing Trades', 0) > 0 else 0)
+                avg_win = gross_profit / winning_trades if winning_trades > 0 else 0
+                avg_loss = gross_loss / losing_trades if losing_trades > 0 else 0
                 
                 initial_equity = 10000
-                roi = ((result.get('Final Equity', initial_equity) - initial_equity) / 
-                    initial_equity) * 100
+                roi = ((final_equity - initial_equity) / initial_equity) * 100
                 
                 # Estimate average option price from trades
-                trades = result.get('Trades', [])
                 avg_option_price = 0
                 if trades:
                     option_prices = [t.get('entry_option_price', 0) for t in trades 
@@ -2216,23 +2439,35 @@ class BacktestEngine:
                     if option_prices:
                         avg_option_price = sum(option_prices) / len(option_prices)
                 
-                writer.writerow([
+                return [
                     symbol_period,
-                    result.get('Win Rate', 0),
-                    result.get('Profit Factor', 0),
-                    result.get('Max Drawdown', 0),
-                    result.get('Total Trades', 0),
-                    result.get('Winning Trades', 0),
-                    result.get('Losing Trades', 0),
-                    result.get('Gross Profit', 0),
-                    result.get('Gross Loss', 0),
+                    win_rate,
+                    profit_factor,
+                    max_drawdown_pct,
+                    total_trades,
+                    winning_trades,
+                    losing_trades,
+                    gross_profit,
+                    gross_loss,
                     round(avg_win, 2),
                     round(avg_loss, 2),
-                    result.get('Final Equity', initial_equity),
+                    final_equity,
                     round(roi, 2),
                     round(avg_option_price, 2),
-                    result.get('Optimal Trailing Method', 'Unknown')
-                ])
+                    trailing_method
+                ]
+            
+            # Write results for every ticker/period in batches of chunk_size rows
+            items = iter(results.items())
+            while True:
+                rows = [summary_row(symbol_period, result)
+                        for symbol_period, result in itertools.islice(items, chunk_size)]
+                if not rows:
+                    break
+                # Format the whole chunk in memory, then hand it to the file in a single write();
+                # object columns keep csv.writer's str() formatting (integer counts stay integers)
+                f.write(pd.DataFrame(rows, columns=header, dtype=object).to_csv(
+                    header=False, index=False, lineterminator='\r\n'))
         
         print(f"[✓] Option trading summary results saved to {output_file}")
         return output_file
\ No newline at end of file
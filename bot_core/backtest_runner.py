@@ -15,7 +15,7 @@ from bot_core.mongodb_handler import get_mongodb_handler
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from bot_core.backtest_directory_manager import BacktestDirectoryManager
+from bot_core.backtest_directory_manager import get_directory_manager
 
 
 class ProfessionalBacktestRunner:
@@ -33,7 +33,7 @@ class ProfessionalBacktestRunner:
         """
         self.config = config or {}
         self.api = api
-        self.dir_manager = BacktestDirectoryManager()
+        self.dir_manager = get_directory_manager()
         
         # Setup logging with file handler
         self.logger = logging.getLogger("BacktestRunner")
@@ -314,7 +314,7 @@ class ProfessionalBacktestRunner:
         """Generate a simple CSV report"""
         import csv
         
-        report_path = os.path.join(self.dir_manager.results_dir, 'Summary', f"{run_id}_summary.csv")
+        report_path = self.dir_manager.get_results_path(run_id, 'summary')
         
         with open(report_path, 'w', newline='') as f:
             writer = csv.writer(f)
@@ -339,8 +339,8 @@ class CandleDataClient:
         Now handles TradeStation's 57,600 bar limit by chunking requests
         """
         # Import directory manager
-        from Code.bot_core.backtest_directory_manager import BacktestDirectoryManager
-        dir_manager = BacktestDirectoryManager()
+        from Code.bot_core.backtest_directory_manager import get_directory_manager
+        dir_manager = get_directory_manager()
         
         result = {}
         
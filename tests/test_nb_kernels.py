@@ -0,0 +1,125 @@
+# tests/test_nb_kernels.py
+#
+# Checks the compiled kernels in bot_core/_nb_kernels.py against the pandas /
+# NumPy code they replace. Without numba the kernels run as plain Python, so the
+# same checks cover both builds.
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# _nb_kernels only depends on numpy, so it is imported straight from bot_core
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'bot_core')))
+
+import _nb_kernels as nk
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+def _prices(rng, n=500):
+    """Random walk close prices with a flat stretch, like a halted or illiquid session"""
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    close[200:230] = close[200]
+    return close
+
+
+def test_ewm_mean_matches_pandas(rng):
+    close = _prices(rng)
+    close[:5] = np.nan
+    for span in (9, 15):
+        expected = pd.Series(close).ewm(span=span, adjust=False).mean().to_numpy()
+        np.testing.assert_allclose(nk.ewm_mean(close, span), expected, rtol=1e-12)
+
+
+def test_rolling_mean_matches_pandas(rng):
+    values = _prices(rng)
+    values[:3] = np.nan
+    for period in (2, 3, 14):
+        expected = pd.Series(values).rolling(period).mean().to_numpy()
+        np.testing.assert_allclose(nk.rolling_mean(values, period), expected, rtol=1e-10)
+
+
+def test_rolling_max_min_match_pandas(rng):
+    values = _prices(rng)
+    values[[0, 50, 51, 300]] = np.nan
+    for period in (1, 5, 20):
+        series = pd.Series(values).rolling(period)
+        np.testing.assert_array_equal(nk.rolling_max(values, period), series.max().to_numpy())
+        np.testing.assert_array_equal(nk.rolling_min(values, period), series.min().to_numpy())
+
+
+def test_bollinger_width_matches_pandas(rng):
+    close = _prices(rng)
+    window, num_std = 20, 2
+    rolling = pd.Series(close).rolling(window=window)
+    middle_band = rolling.mean().to_numpy()
+    std = rolling.std().to_numpy()
+    expected = ((middle_band + std * num_std) - (middle_band - std * num_std)) / middle_band
+    np.testing.assert_allclose(nk.bollinger_width(close, window, num_std), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_heiken_ashi_matches_numpy(rng):
+    close = _prices(rng)
+    open_ = close + rng.normal(0, 0.3, len(close))
+    high = np.maximum(open_, close) + rng.uniform(0, 0.5, len(close))
+    low = np.minimum(open_, close) - rng.uniform(0, 0.5, len(close))
+    open_[10] = np.nan
+    high[20] = np.nan
+
+    ha_open = open_.copy()
+    prev_mid = (open_[:-1] + close[:-1]) / 2
+    ha_open[1:] = np.where(np.isnan(prev_mid), open_[1:], prev_mid)
+    expected = (ha_open, (open_ + high + low + close) / 4,
+                np.fmax(np.fmax(high, open_), close), np.fmin(np.fmin(low, open_), close))
+
+    for got, want in zip(nk.heiken_ashi(open_, high, low, close), expected):
+        np.testing.assert_allclose(got, want, rtol=0, atol=0)
+
+
+def test_equity_drawdown_matches_vectorized(rng):
+    pnl = np.ascontiguousarray(rng.normal(5, 400, (nk.N_METHODS, 60)))
+    for initial_equity in (10000.0, 0.0):
+        final_nb, dd_nb = nk.equity_drawdown(initial_equity, pnl)
+        final_np, dd_np = nk.equity_drawdown_vectorized(initial_equity, pnl)
+        np.testing.assert_allclose(final_nb, final_np, rtol=1e-12)
+        np.testing.assert_allclose(dd_nb, dd_np, rtol=1e-12)
+
+
+@pytest.mark.parametrize("exit_params", [
+    (1.5, 25.0, 0.50, 3, 10.0, 80.0, 20.0),
+    (0.3, 5.0, 0.20, 0, 2.0, 70.0, 30.0),
+])
+def test_simulate_all_signals_matches_per_signal_walk(rng, exit_params):
+    close = _prices(rng, 400)
+    n = len(close)
+    atr = np.abs(rng.normal(1, 0.5, n))
+    ha_open = close + rng.normal(0, 0.5, n)
+    ha_close = close + rng.normal(0, 0.5, n)
+    stoch_k = rng.uniform(0, 100, n)
+    stoch_d = rng.uniform(0, 100, n)
+    vwap = close + rng.normal(0, 1, n)
+    ema15 = close + rng.normal(0, 1, n)
+    atr[:20] = np.nan
+    vwap[:20] = np.nan
+    series = (close, atr, ha_open, ha_close, stoch_k, stoch_d, vwap, ema15)
+
+    signal_idx = np.sort(rng.choice(n - 1, 80, replace=False)).astype(np.int64)
+    directions = rng.choice(np.array([1, -1], dtype=np.int64), len(signal_idx))
+    entry_option_prices = np.maximum(close[signal_idx] * 0.25 * (7 / 365) ** 0.5 * 0.4 * 0.8, 0.10)
+
+    walks = [nk.simulate_all_methods(*series, idx, direction, price, *exit_params)
+             for idx, direction, price in zip(signal_idx, directions, entry_option_prices)]
+    expected = tuple(np.array([walk[part] for walk in walks]) for part in range(3))
+
+    for simulate in (nk.simulate_all_signals, nk.simulate_all_signals_vectorized):
+        exit_idx, exit_price, exit_reason = simulate(*series, signal_idx, directions, entry_option_prices,
+                                                     *exit_params)
+        np.testing.assert_array_equal(exit_idx, expected[0])
+        np.testing.assert_array_equal(exit_reason, expected[2])
+        np.testing.assert_allclose(exit_price, expected[1], rtol=1e-12)